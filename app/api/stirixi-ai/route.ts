@@ -1,8 +1,6 @@
 import { GoogleGenerativeAI } from '@google/generative-ai';
 import { NextRequest, NextResponse } from 'next/server';
 
-import type { Engineer, Project, Prospect } from '@/lib/types';
-
 const GEMINI_MODEL =
   process.env.STIRIXI_AI_MODEL || 'gemini-2.5-flash';
 const GEMINI_API_KEY = process.env.GEMINI_API_KEY;
@@ -48,22 +46,41 @@ const getGeminiModel = () => {
   return geminiClient.getGenerativeModel({ model: GEMINI_MODEL });
 };
 
-type Prompt = {
-  _id: string;
-  model: string;
-  date: string;
-  tokens: number;
-  text: string;
-  engineer: string;
-};
-
-type Action = {
-  _id: string;
-  engineer?: string;
-  project?: string;
-  action_type: string;
-  description: string;
-  date: string;
+type InsightsRollup = {
+  snapshot: {
+    total_engineers: number;
+    avg_prs: number;
+    avg_bugs: number;
+    avg_token_cost: number;
+  };
+  top_engineers: {
+    id: string;
+    name: string;
+    title: string;
+    pr_count: number;
+    bug_count: number;
+    performance: number;
+  }[];
+  ai_usage: {
+    total_prompts: number;
+    total_tokens: number;
+    avg_tokens_per_prompt: number;
+  };
+  recent_action_counts: Record<string, number>;
+  project_health: {
+    id: string;
+    title: string;
+    importance: string;
+    engineer_count: number;
+    prospect_count: number;
+  }[];
+  pipeline: {
+    id: string;
+    name: string;
+    title: string;
+    performance: number;
+    pr_count: number;
+  }[];
 };
 
 type ChatMessage = {
@@ -162,111 +179,59 @@ async function gatherInsights(): Promise<StirixiAIInsights> {
   log('Fetching fresh insights snapshot');
   const start = performance.now();
 
-  const [engineersResp, projectsResp, prospectsResp, promptsResp, actionsResp] = await Promise.all([
-    fetchJSON<Engineer[]>('/engineers/'),
-    fetchJSON<Project[]>('/projects/'),
-    fetchJSON<Prospect[]>('/prospects/'),
-    fetchJSON<Prompt[]>('/prompts/'),
-    fetchJSON<Action[]>('/actions/'),
-  ]);
-
-  const engineers = engineersResp ?? [];
-  const projects = projectsResp ?? [];
-  const prospects = prospectsResp ?? [];
-  const prompts = promptsResp ?? [];
-  const actions = actionsResp ?? [];
+  const rollup = await fetchJSON<InsightsRollup>('/insights/snapshot');
 
   if (
-    engineers.length === 0 &&
-    projects.length === 0 &&
-    prospects.length === 0
+    !rollup ||
+    (rollup.snapshot.total_engineers === 0 &&
+      rollup.project_health.length === 0 &&
+      rollup.pipeline.length === 0)
   ) {
     return deriveInsights();
   }
 
-  const snapshot = (() => {
-    if (engineers.length === 0) {
-      return {
-        totalEngineers: 0,
-        avgPrs: 0,
-        avgBugs: 0,
-        avgTokenCost: 0,
-      };
-    }
-    const totals = engineers.reduce(
-      (acc, eng) => {
-        acc.prs += eng.pr_count ?? 0;
-        acc.bugs += eng.bug_count ?? 0;
-        acc.token += eng.token_cost ?? 0;
-        return acc;
-      },
-      { prs: 0, bugs: 0, token: 0 }
-    );
-    return {
-      totalEngineers: engineers.length,
-      avgPrs: toFixed(totals.prs / engineers.length),
-      avgBugs: toFixed(totals.bugs / engineers.length),
-      avgTokenCost: toFixed(totals.token / engineers.length, 0),
-    };
-  })();
-
-  const topEngineers = engineers
-    .slice()
-    .sort((a, b) => b.pr_count - a.pr_count)
-    .slice(0, 5)
-    .map((eng) => {
-      const perf = eng.monthly_performance?.length
-        ? eng.monthly_performance[eng.monthly_performance.length - 1]
-        : 0;
-      return {
-        name: eng.name,
-        title: eng.title,
-        prCount: eng.pr_count,
-        bugCount: eng.bug_count,
-        performance: perf,
-      };
-    });
+  const snapshot = {
+    totalEngineers: rollup.snapshot.total_engineers,
+    avgPrs: toFixed(rollup.snapshot.avg_prs),
+    avgBugs: toFixed(rollup.snapshot.avg_bugs),
+    avgTokenCost: toFixed(rollup.snapshot.avg_token_cost, 0),
+  };
+
+  const topEngineers = rollup.top_engineers.map((eng) => ({
+    name: eng.name,
+    title: eng.title,
+    prCount: eng.pr_count,
+    bugCount: eng.bug_count,
+    performance: eng.performance,
+  }));
 
-  const projectHealth = projects
-    .slice()
-    .sort((a, b) => (b.importance || '').localeCompare(a.importance || ''))
-    .map((project) => ({
-      title: project.title,
-      importance: project.importance,
-      engineerCount: project.engineers?.length ?? 0,
-      prospectCount: project.prospects?.length ?? 0,
-    }));
-
-  const pipeline = prospects
-    .slice()
-    .sort((a, b) => (b.performance ?? 0) - (a.performance ?? 0))
-    .slice(0, 5)
-    .map((prospect) => ({
-      name: prospect.name,
-      title: prospect.title,
-      performance: toFixed(prospect.performance ?? 0, 1),
-      prCount: prospect.pr_count ?? 0,
-    }));
+  const projectHealth = rollup.project_health.map((project) => ({
+    title: project.title,
+    importance: project.importance,
+    engineerCount: project.engineer_count,
+    prospectCount: project.prospect_count,
+  }));
+
+  const pipeline = rollup.pipeline.map((prospect) => ({
+    name: prospect.name,
+    title: prospect.title,
+    performance: toFixed(prospect.performance ?? 0, 1),
+    prCount: prospect.pr_count ?? 0,
+  }));
 
   // Add AI usage insights from prompts
-  const aiUsageStats = prompts.length > 0 ? (() => {
-    const totalTokens = prompts.reduce((sum, p) => sum + (p.tokens || 0), 0);
-    const recentPrompts = prompts.slice(0, 10);
-    const avgTokensPerPrompt = prompts.length > 0 ? totalTokens / prompts.length : 0;
-    return `AI Usage: ${prompts.length} prompts total | ${totalTokens.toLocaleString()} tokens | ${avgTokensPerPrompt.toFixed(0)} avg tokens/prompt | Recent: ${recentPrompts.length} prompts`;
-  })() : 'No AI usage data available.';
+  const { ai_usage: aiUsage } = rollup;
+  const aiUsageStats = aiUsage.total_prompts > 0
+    ? `AI Usage: ${aiUsage.total_prompts} prompts total | ${aiUsage.total_tokens.toLocaleString()} tokens | ${aiUsage.avg_tokens_per_prompt.toFixed(0)} avg tokens/prompt`
+    : 'No AI usage data available.';
 
   // Add recent actions context
-  const recentActions = actions.length > 0 ? (() => {
-    const actionsByType = actions.slice(0, 20).reduce((acc, action) => {
-      acc[action.action_type] = (acc[action.action_type] || 0) + 1;
-      return acc;
-    }, {} as Record<string, number>);
-    const actionSummary = Object.entries(actionsByType)
-      .map(([type, count]) => `${count} ${type}`)
-      .join(', ');
-    return `Recent Activity (last 20): ${actionSummary}`;
-  })() : 'No recent activity data available.';
+  const recentActionEntries = Object.entries(rollup.recent_action_counts);
+  const recentActions = recentActionEntries.length > 0
+    ? `Recent Activity (last 20): ${recentActionEntries
+        .map(([type, count]) => `${count} ${type}`)
+        .join(', ')}`
+    : 'No recent activity data available.';
 
   const contextLines = [
     `Org Snapshot: ${snapshot.totalEngineers} engineers | ${snapshot.avgPrs} avg PRs/mo | ${snapshot.avgBugs} avg bugs/mo | $${snapshot.avgTokenCost} avg AI spend`,
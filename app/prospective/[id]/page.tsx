@@ -75,6 +75,7 @@ export default async function ProspectiveHirePage({
     avg_review_time: prospect.avg_review_time,
     token_cost: prospect.token_cost,
     prompt_history: [],
+    prompt_count: 0,
     monthly_performance: [prospect.performance], // Use prospect's performance score
     recent_actions: [],
   };
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import engineers, prompts, prospects, projects, actions
+from app.api.v1 import engineers, prompts, prospects, projects, actions, insights, search, stream, usage
 
 api_router = APIRouter()
 
@@ -8,4 +8,7 @@ api_router.include_router(prompts.router, prefix="/prompts", tags=["prompts"])
 api_router.include_router(prospects.router, prefix="/prospects", tags=["prospects"])
 api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
 api_router.include_router(actions.router, prefix="/actions", tags=["actions"])
-
+api_router.include_router(insights.router, prefix="/insights", tags=["insights"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(usage.router, prefix="/usage", tags=["usage"])
+api_router.include_router(stream.router, prefix="/stream", tags=["stream"])
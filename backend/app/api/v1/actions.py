@@ -1,77 +1,313 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from functools import partial
+from typing import Any, Dict, List, Optional
+from datetime import datetime
 from bson import ObjectId
-from app.core.database import get_database
+from pymongo import ReturnDocument
+from app.core.batch import fetch_batch
+from app.core.buckets import BucketUnit, bucket_range, date_trunc, event_series
+from app.core.bulk import bulk_insert, bulk_request_body
+from app.core.cache import cached, record_write
+from app.core.counting import set_total_count
+from app.core.database import get_database, write_transaction
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    apply_cursor,
+    fetch_page,
+)
+from app.core.projection import Projection, projected_response, projection_params
+from app.core.references import reference_id
+from app.core.serialization import FastJSONResponse, fast_response
+from app.core.streaming import date_range_filter, ndjson_response
+from app.core.versioning import conditional_get
+from app.core.write_hooks import (
+    DELETE_HOOK_PROJECTIONS,
+    apply_delete_hooks,
+    apply_insert_hooks,
+    apply_update_hooks,
+    inserted_hook,
+)
 from app.models.action import Action
+from app.models.activity import ActionFacets, ActionHistogram
+from app.models.batch import BatchRequest, BatchResult
+from app.models.bulk import BulkResult
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[Action])
-async def get_actions(
+# Indexes for hinted counts: a project filter is usually the more selective one,
+# and every action listing filters on engineer
+ACTION_COUNT_HINTS = [
+    [("project", 1), ("date", -1), ("_id", -1)],
+    [("engineer", 1), ("date", -1), ("_id", -1)],
+]
+
+
+# Values returned per facet by GET /actions/facets
+DEFAULT_FACET_LIMIT = 50
+MAX_FACET_LIMIT = 500
+
+
+def _facet_branch(field: str, limit: int, lookup: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """Count per `field` value, most frequent first, optionally labelled from a joined collection"""
+    branch: List[Dict[str, Any]] = [
+        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": limit},
+    ]
+    if lookup is None:
+        branch.append({"$project": {"_id": 0, field: "$_id", "count": 1}})
+        return branch
+    source, label = lookup["from"], lookup["label"]
+    # Runs on at most `limit` rows, each an _id lookup
+    branch += [
+        {"$lookup": {"from": source, "localField": "_id", "foreignField": "_id", "as": "ref"}},
+        {
+            "$project": {
+                "_id": 0,
+                "id": "$_id",
+                label: {"$arrayElemAt": [f"$ref.{label}", 0]},
+                "count": 1,
+            }
+        },
+    ]
+    return branch
+
+
+def facets_pipeline(query: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    """One $match over the indexed filters, then every facet from the same rows"""
+    return [
+        {"$match": query},
+        {
+            "$facet": {
+                "total": [{"$count": "count"}],
+                "events": _facet_branch("event", limit),
+                "engineers": _facet_branch("engineer", limit, {"from": "engineers", "label": "name"}),
+                "projects": _facet_branch("project", limit, {"from": "projects", "label": "title"}),
+            }
+        },
+    ]
+
+
+def build_action_query(
     engineer_id: Optional[str] = None,
     project_id: Optional[str] = None,
-    event: Optional[str] = None
-):
-    """Get all actions, optionally filtered by engineer, project, or event"""
-    db = get_database()
+    event: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build the MongoDB filter shared by the action listing endpoints"""
     query = {}
-    
-    # Build MongoDB query with filters
+    # References are always ObjectId or null (scripts/normalize_references.py), so an
+    # unfiltered listing is a plain scan of the (date, _id) index
     if engineer_id and ObjectId.is_valid(engineer_id):
         query["engineer"] = ObjectId(engineer_id)
-    else:
-        # If no specific engineer filter, exclude actions with invalid engineer field
-        query["engineer"] = {
-            "$exists": True,
-            "$ne": "",
-            "$type": "objectId"
-        }
-    
     if project_id and ObjectId.is_valid(project_id):
         query["project"] = ObjectId(project_id)
     if event:
         query["event"] = event
-    
-    actions = await db.actions.find(query).sort("date", -1).to_list(length=1000)
-    return actions
+    return query
+
+
+def action_document(action: Action) -> Dict[str, Any]:
+    """Build the MongoDB document for a new action; raises ValueError on bad references"""
+    action_dict = action.model_dump(exclude={"id"})  # Exclude id, MongoDB will generate it
+    action_dict["engineer"] = reference_id(action_dict.get("engineer"), "engineer")
+    action_dict["project"] = reference_id(action_dict.get("project"), "project", required=False)
+    return action_dict
+
+
+@router.get(
+    "/",
+    response_model=List[Action],
+    dependencies=[Depends(conditional_get("actions"))],
+)
+async def get_actions(
+    response: Response,
+    engineer_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    event: Optional[str] = None,
+    after: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page",
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    projection: Projection = Depends(projection_params(Action, model_fields_only=True)),
+):
+    """Get actions newest first, optionally filtered by engineer, project, or event.
+
+    Results are keyset-paginated on (date, _id); when more rows exist the
+    cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    db = get_database()
+    query = build_action_query(engineer_id, project_id, event)
+    await set_total_count(response, db.actions, query, hints=ACTION_COUNT_HINTS)
+
+    try:
+        query = apply_cursor(query, after)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    actions, next_cursor = await fetch_page(db.actions, query, limit, projection)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return fast_response(Action, actions, projection, response=response)
+
+
+@router.get(
+    "/export",
+    summary="Stream actions as NDJSON",
+    response_class=StreamingResponse,
+)
+async def export_actions(
+    engineer_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    event: Optional[str] = None,
+    start: Optional[datetime] = Query(default=None, description="Inclusive lower bound on date"),
+    end: Optional[datetime] = Query(default=None, description="Exclusive upper bound on date"),
+):
+    """Stream every matching action, newest first, one JSON document per line"""
+    db = get_database()
+    query = build_action_query(engineer_id, project_id, event)
+    date_range = date_range_filter(start, end)
+    if date_range:
+        query["date"] = date_range
+    cursor = db.actions.find(query).sort("date", -1)
+    return ndjson_response(cursor, "actions.ndjson")
 
 
-@router.get("/{action_id}", response_model=Action)
-async def get_action(action_id: str):
+@router.get(
+    "/histogram",
+    response_model=ActionHistogram,
+    dependencies=[Depends(conditional_get("actions"))],
+)
+async def get_actions_histogram(
+    engineer_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    event: Optional[str] = None,
+    start: Optional[datetime] = Query(default=None, description="Inclusive lower bound on date (default: 30 buckets back)"),
+    end: Optional[datetime] = Query(default=None, description="Exclusive upper bound on date (default: now)"),
+    bucket: BucketUnit = Query(default="day", description="Bucket size"),
+):
+    """Action counts per day, week or month by event, zero-filled so every bucket is present.
+
+    Grouping runs in MongoDB ($dateTrunc), so the payload is one row per bucket
+    instead of one per action.
+    """
+    db = get_database()
+    try:
+        start, end, buckets = bucket_range(start, end, bucket)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    query = build_action_query(engineer_id, project_id, event)
+    query["date"] = {"$gte": start, "$lt": end}
+    rows = await db.actions.aggregate([
+        {"$match": query},
+        {
+            "$group": {
+                "_id": {"bucket": date_trunc("$date", bucket), "event": "$event"},
+                "count": {"$sum": 1},
+            }
+        },
+    ]).to_list(length=None)
+
+    events, series = event_series(rows, buckets)
+    return {"bucket": bucket, "start": start, "end": end, "events": events, "series": series}
+
+
+@router.get(
+    "/facets",
+    response_model=ActionFacets,
+    dependencies=[Depends(conditional_get("actions", "engineers", "projects"))],
+)
+@cached("actions", "engineers", "projects", joins_related=True)
+async def get_action_facets(
+    engineer_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    event: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_FACET_LIMIT, ge=1, le=MAX_FACET_LIMIT, description="Values per facet"),
+):
+    """Action counts by event, engineer and project for the same filters as the listing.
+
+    All facets come from one $facet aggregation; results are cached per
+    filter combination until the next action, engineer or project write
+    (the facets embed engineer names and project titles).
+    """
+    db = get_database()
+    query = build_action_query(engineer_id, project_id, event)
+    documents = await db.actions.aggregate(facets_pipeline(query, limit)).to_list(length=1)
+    facets = documents[0]
+    total = facets.pop("total")
+    return {"total": total[0]["count"] if total else 0, **facets}
+
+
+@router.get(
+    "/{action_id}",
+    response_model=Action,
+    dependencies=[Depends(conditional_get("actions"))],
+)
+async def get_action(
+    action_id: str,
+    response: Response,
+    projection: Projection = Depends(projection_params(Action)),
+):
     """Get a single action by ID"""
     db = get_database()
     if not ObjectId.is_valid(action_id):
         raise HTTPException(status_code=400, detail="Invalid action ID")
     
-    action = await db.actions.find_one({"_id": ObjectId(action_id)})
+    action = await db.actions.find_one({"_id": ObjectId(action_id)}, projection)
     if not action:
         raise HTTPException(status_code=404, detail="Action not found")
-    return action
+    return projected_response(Action, action, projection, response=response)
+
+
+@router.post("/batch", response_model=BatchResult[Action])
+async def get_actions_batch(request: BatchRequest):
+    """Resolve many actions by ID in one query, in the order requested"""
+    db = get_database()
+    return await fetch_batch(db.actions, request.ids, "action")
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    openapi_extra=bulk_request_body(Action),
+)
+async def create_actions_bulk(request: Request):
+    """Insert many actions from a JSON array or an NDJSON stream (Content-Type: application/x-ndjson).
+
+    Items are validated and written in chunks with unordered insert_many;
+    each item's outcome is reported by its position in the body.
+    """
+    db = get_database()
+    result = await bulk_insert(
+        request, db.actions, "actions", Action, action_document,
+        after_insert=partial(inserted_hook, "actions"),
+    )
+    # Per-item results can be large; encode them directly instead of re-validating
+    return FastJSONResponse(result)
 
 
 @router.post("/", response_model=Action, status_code=201)
 async def create_action(action: Action):
     """Create a new action"""
     db = get_database()
-    action_dict = action.model_dump(exclude={"id"})  # Exclude id, MongoDB will generate it
-    
-    # Convert engineer ObjectId string to ObjectId if needed
-    if isinstance(action_dict.get("engineer"), str) and ObjectId.is_valid(action_dict["engineer"]):
-        action_dict["engineer"] = ObjectId(action_dict["engineer"])
-    elif not isinstance(action_dict.get("engineer"), ObjectId):
-        raise HTTPException(status_code=400, detail="Invalid engineer ID")
+    try:
+        action_dict = action_document(action)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     
-    # Convert project ObjectId string to ObjectId if provided
-    if action_dict.get("project"):
-        if isinstance(action_dict["project"], str) and ObjectId.is_valid(action_dict["project"]):
-            action_dict["project"] = ObjectId(action_dict["project"])
-        elif not isinstance(action_dict["project"], ObjectId):
-            raise HTTPException(status_code=400, detail="Invalid project ID")
-    
-    result = await db.actions.insert_one(action_dict)
-    created_action = await db.actions.find_one({"_id": result.inserted_id})
-    return created_action
+    # insert_one sets _id on the dict, so it is already the stored document
+    async with write_transaction() as session:
+        await db.actions.insert_one(action_dict, session=session)
+        engineer_ids = await apply_insert_hooks(db, "actions", [action_dict], session=session)
+    record_write("actions", action_dict["_id"])
+    for engineer_id in engineer_ids:
+        record_write("engineers", engineer_id)
+    return action_dict
 
 
 @router.put("/{action_id}", response_model=Action)
@@ -83,29 +319,30 @@ async def update_action(action_id: str, action: Action):
     
     update_data = action.model_dump(exclude_unset=True, exclude={"id"})
     
-    # Convert engineer ObjectId string to ObjectId if provided
-    if "engineer" in update_data:
-        if isinstance(update_data["engineer"], str) and ObjectId.is_valid(update_data["engineer"]):
-            update_data["engineer"] = ObjectId(update_data["engineer"])
-        elif not isinstance(update_data["engineer"], ObjectId):
-            raise HTTPException(status_code=400, detail="Invalid engineer ID")
-    
-    # Convert project ObjectId string to ObjectId if provided
-    if "project" in update_data and update_data["project"]:
-        if isinstance(update_data["project"], str) and ObjectId.is_valid(update_data["project"]):
-            update_data["project"] = ObjectId(update_data["project"])
-        elif not isinstance(update_data["project"], ObjectId):
-            raise HTTPException(status_code=400, detail="Invalid project ID")
+    try:
+        if "engineer" in update_data:
+            update_data["engineer"] = reference_id(update_data["engineer"], "engineer")
+        if "project" in update_data:
+            update_data["project"] = reference_id(update_data["project"], "project", required=False)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     
-    result = await db.actions.update_one(
-        {"_id": ObjectId(action_id)},
-        {"$set": update_data}
-    )
-    
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Action not found")
+    async with write_transaction() as session:
+        # The previous version drives the derived-data hooks; $set gives the new one
+        previous_action = await db.actions.find_one_and_update(
+            {"_id": ObjectId(action_id)},
+            {"$set": update_data},
+            return_document=ReturnDocument.BEFORE,
+            session=session,
+        )
+        if previous_action is None:
+            raise HTTPException(status_code=404, detail="Action not found")
+        updated_action = {**previous_action, **update_data}
+        engineer_ids = await apply_update_hooks(db, "actions", previous_action, updated_action, session=session)
     
-    updated_action = await db.actions.find_one({"_id": ObjectId(action_id)})
+    record_write("actions", action_id)
+    for engineer_id in engineer_ids:
+        record_write("engineers", engineer_id)
     return updated_action
 
 
@@ -116,7 +353,16 @@ async def delete_action(action_id: str):
     if not ObjectId.is_valid(action_id):
         raise HTTPException(status_code=400, detail="Invalid action ID")
     
-    result = await db.actions.delete_one({"_id": ObjectId(action_id)})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Action not found")
+    async with write_transaction() as session:
+        deleted = await db.actions.find_one_and_delete(
+            {"_id": ObjectId(action_id)},
+            projection=DELETE_HOOK_PROJECTIONS["actions"],
+            session=session,
+        )
+        if deleted is None:
+            raise HTTPException(status_code=404, detail="Action not found")
+        engineer_ids = await apply_delete_hooks(db, "actions", deleted, session=session)
+    record_write("actions", action_id)
+    for engineer_id in engineer_ids:
+        record_write("engineers", engineer_id)
     return None
@@ -1,36 +1,192 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from bson import ObjectId
+from pymongo import ReturnDocument
 
-from app.core.database import get_database
+from app.core.batch import fetch_batch
+from app.core.cache import cached, record_write
+from app.core.cascade import delete_engineer_cascade
+from app.core.counting import set_total_count
+from app.core.database import get_database, write_transaction
+from app.core.engineer_stats import STATS_COLLECTION
+from app.core.expansion import (
+    DEFAULT_EXPAND_LIMIT,
+    MAX_EXPAND_LIMIT,
+    expanded_projection,
+    expansion_params,
+    lookup_stage,
+)
+from app.core.projection import Projection, projected_response, projection_params
+from app.core.rankings import (
+    LEADERBOARD_METRICS,
+    RANKING_FIELDS,
+    leaderboard_page,
+    refresh_engineer_rankings,
+)
+from app.core.serialization import fast_response
+from app.core.streaming import date_range_filter, ndjson_response
+from app.core.versioning import conditional_get
+from app.models.batch import BatchRequest, BatchResult
 from app.models.engineer import Engineer, PyObjectId
 from app.models.engineer_score import EngineerScore
+from app.models.engineer_stats import EngineerStats
+from app.models.expanded import ExpandedEngineer
+from app.models.leaderboard import Leaderboard
 from app.services import SolanaSBTError, solana_sbt_service
 
 router = APIRouter()
 
+# expand name -> (collection, localField, foreignField, sub-pipeline sort)
+ENGINEER_EXPANSIONS = {
+    "recent_actions": ("actions", "recent_actions", "_id", {"date": -1}),
+    "prompt_history": ("prompts", "prompt_history", "_id", {"date": -1}),
+    "projects": ("projects", "_id", "engineers", {"start_date": -1}),
+}
 
-@router.get("/", response_model=List[Engineer])
-async def get_engineers():
+
+@router.get(
+    "/",
+    response_model=List[Engineer],
+    dependencies=[Depends(conditional_get("engineers"))],
+)
+@cached("engineers")
+async def get_engineers(
+    response: Response,
+    projection: Projection = Depends(projection_params(Engineer, model_fields_only=True)),
+):
     """Get all engineers"""
     db = get_database()
-    engineers = await db.engineers.find().to_list(length=1000)
-    return engineers
+    engineers = await db.engineers.find({}, projection).to_list(length=1000)
+    await set_total_count(response, db.engineers, {})
+    return fast_response(Engineer, engineers, projection, response=response)
+
+
+@router.get(
+    "/scores/export",
+    summary="Stream engineer score snapshots as NDJSON",
+    response_class=StreamingResponse,
+)
+async def export_engineer_scores(
+    engineer_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    start: Optional[datetime] = Query(default=None, description="Inclusive lower bound on last_updated"),
+    end: Optional[datetime] = Query(default=None, description="Exclusive upper bound on last_updated"),
+):
+    """Stream every matching score snapshot, newest first, one JSON document per line"""
+    db = get_database()
+    query = {}
+    if engineer_id and ObjectId.is_valid(engineer_id):
+        query["engineer_id"] = ObjectId(engineer_id)
+    if project_id and ObjectId.is_valid(project_id):
+        query["project_id"] = ObjectId(project_id)
+    date_range = date_range_filter(start, end)
+    if date_range:
+        query["last_updated"] = date_range
+    cursor = db.engineer_scores.find(query).sort("last_updated", -1)
+    return ndjson_response(cursor, "engineer_scores.ndjson")
+
+
+@router.get(
+    "/stats",
+    response_model=List[EngineerStats],
+    dependencies=[Depends(conditional_get("actions", "prompts"))],
+)
+async def get_engineers_stats():
+    """Activity counters for every engineer with recorded actions or prompts"""
+    db = get_database()
+    return await db[STATS_COLLECTION].find({}).to_list(length=1000)
+
 
+@router.get(
+    "/leaderboard",
+    response_model=Leaderboard,
+    dependencies=[Depends(conditional_get("engineers", "actions", "prompts"))],
+)
+@cached("engineers", "actions", "prompts")
+async def get_leaderboard(
+    metric: Literal["performance", "bug_rate", "token_cost_per_pr", "actions", "prompts"] = Query(
+        default="performance",
+        description="performance, actions or prompts (higher is better), bug_rate or token_cost_per_pr (lower is better)",
+    ),
+    window: str = Query(
+        default="all",
+        description="Monthly performance scores averaged: latest, 3m, 6m, 12m or all; other metrics use all",
+    ),
+    limit: int = Query(default=10, ge=1, le=100),
+):
+    """Top engineers for a metric with their rank and percentile.
 
-@router.get("/{engineer_id}", response_model=Engineer)
-async def get_engineer(engineer_id: str):
-    """Get a single engineer by ID"""
+    Served from precomputed ranking documents, so a top-N read walks N
+    index keys. The engineer write handlers keep the profile metrics current;
+    the action and prompt write hooks re-rank actions and prompts from
+    engineer_stats.
+    """
+    windows, _ = LEADERBOARD_METRICS[metric]
+    if window not in windows:
+        raise HTTPException(
+            status_code=400,
+            detail=f"window for {metric} must be one of: {', '.join(windows)}",
+        )
+    db = get_database()
+    total, entries = await leaderboard_page(db, metric, window, limit)
+    return {"metric": metric, "window": window, "total": total, "entries": entries}
+
+
+@router.get(
+    "/{engineer_id}",
+    response_model=ExpandedEngineer,
+    dependencies=[Depends(conditional_get("actions", "engineers", "projects", "prompts"))],
+)
+@cached("engineers", "actions", "prompts", "projects", id_param="engineer_id")
+async def get_engineer(
+    engineer_id: str,
+    response: Response,
+    projection: Projection = Depends(projection_params(Engineer)),
+    expand: List[str] = Depends(expansion_params(set(ENGINEER_EXPANSIONS))),
+    expand_limit: int = Query(
+        default=DEFAULT_EXPAND_LIMIT,
+        ge=1,
+        le=MAX_EXPAND_LIMIT,
+        description="Maximum number of documents resolved per expanded reference",
+    ),
+):
+    """Get a single engineer by ID, optionally resolving its references.
+
+    With `expand`, the referenced documents are joined server-side in one
+    aggregation and returned under `expanded`, newest first.
+    """
     db = get_database()
     if not ObjectId.is_valid(engineer_id):
         raise HTTPException(status_code=400, detail="Invalid engineer ID")
     
-    engineer = await db.engineers.find_one({"_id": ObjectId(engineer_id)})
+    if not expand:
+        engineer = await db.engineers.find_one({"_id": ObjectId(engineer_id)}, projection)
+    else:
+        pipeline = [{"$match": {"_id": ObjectId(engineer_id)}}, {"$limit": 1}]
+        for name in expand:
+            source, local_field, foreign_field, sort = ENGINEER_EXPANSIONS[name]
+            pipeline.append(
+                lookup_stage(source, local_field, foreign_field, name, expand_limit, sort)
+            )
+        projection = expanded_projection(projection)
+        if projection:
+            pipeline.append({"$project": projection})
+        documents = await db.engineers.aggregate(pipeline).to_list(length=1)
+        engineer = documents[0] if documents else None
+
     if not engineer:
         raise HTTPException(status_code=404, detail="Engineer not found")
-    return engineer
+    return projected_response(ExpandedEngineer, engineer, projection, response=response)
+
+
+@router.post("/batch", response_model=BatchResult[Engineer])
+async def get_engineers_batch(request: BatchRequest):
+    """Resolve many engineers by ID in one query, in the order requested"""
+    db = get_database()
+    return await fetch_batch(db.engineers, request.ids, "engineer")
 
 
 @router.post("/", response_model=Engineer, status_code=201)
@@ -45,9 +201,12 @@ async def create_engineer(engineer: Engineer):
     if engineer_dict.get("recent_actions"):
         engineer_dict["recent_actions"] = [ObjectId(aid) if isinstance(aid, str) and ObjectId.is_valid(aid) else aid for aid in engineer_dict["recent_actions"]]
     
-    result = await db.engineers.insert_one(engineer_dict)
-    created_engineer = await db.engineers.find_one({"_id": result.inserted_id})
-    return created_engineer
+    # insert_one sets _id on the dict, so it is already the stored document
+    async with write_transaction() as session:
+        result = await db.engineers.insert_one(engineer_dict, session=session)
+        await refresh_engineer_rankings(db, engineer_dict, session=session)
+    record_write("engineers", result.inserted_id)
+    return engineer_dict
 
 
 @router.put("/{engineer_id}", response_model=Engineer)
@@ -65,28 +224,46 @@ async def update_engineer(engineer_id: str, engineer: Engineer):
     if "recent_actions" in update_data and update_data["recent_actions"]:
         update_data["recent_actions"] = [ObjectId(aid) if isinstance(aid, str) and ObjectId.is_valid(aid) else aid for aid in update_data["recent_actions"]]
     
-    result = await db.engineers.update_one(
-        {"_id": ObjectId(engineer_id)},
-        {"$set": update_data}
-    )
-    
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Engineer not found")
+    async with write_transaction() as session:
+        updated_engineer = await db.engineers.find_one_and_update(
+            {"_id": ObjectId(engineer_id)},
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER,
+            session=session,
+        )
+        if updated_engineer is None:
+            raise HTTPException(status_code=404, detail="Engineer not found")
+        if any(field in update_data for field in RANKING_FIELDS):
+            await refresh_engineer_rankings(db, updated_engineer, session=session)
     
-    updated_engineer = await db.engineers.find_one({"_id": ObjectId(engineer_id)})
+    record_write("engineers", engineer_id)
     return updated_engineer
 
 
 @router.delete("/{engineer_id}", status_code=204)
-async def delete_engineer(engineer_id: str):
-    """Delete an engineer"""
+async def delete_engineer(
+    engineer_id: str,
+    archive: bool = Query(
+        default=False,
+        description="Move the deleted documents to *_archive collections instead of dropping them",
+    ),
+):
+    """Delete an engineer with their actions and prompts, and pull them from project teams"""
     db = get_database()
     if not ObjectId.is_valid(engineer_id):
         raise HTTPException(status_code=400, detail="Invalid engineer ID")
     
-    result = await db.engineers.delete_one({"_id": ObjectId(engineer_id)})
-    if result.deleted_count == 0:
+    async with write_transaction() as session:
+        removed = await delete_engineer_cascade(db, ObjectId(engineer_id), archive=archive, session=session)
+    if not removed:
         raise HTTPException(status_code=404, detail="Engineer not found")
+    record_write("engineers", engineer_id)
+    for project_id in removed["project_ids"]:
+        record_write("projects", project_id)
+    if removed["actions"]:
+        record_write("actions")
+    if removed["prompts"]:
+        record_write("prompts")
     return None
 
 
@@ -141,6 +318,7 @@ async def publish_engineer_score(engineer_id: str, score: EngineerScore):
 
     result = await db.engineer_scores.insert_one(db_doc)
     score.id = PyObjectId(result.inserted_id)
+    record_write("engineer_scores", result.inserted_id)
     return score
 
 
@@ -148,6 +326,7 @@ async def publish_engineer_score(engineer_id: str, score: EngineerScore):
     "/{engineer_id}/scores",
     response_model=List[EngineerScore],
     summary="List score snapshots for an engineer",
+    dependencies=[Depends(conditional_get("engineer_scores"))],
 )
 async def list_engineer_scores(
     engineer_id: str,
@@ -175,6 +354,7 @@ async def list_engineer_scores(
     "/{engineer_id}/scores/latest",
     response_model=Optional[EngineerScore],
     summary="Get the latest SBT snapshot for an engineer",
+    dependencies=[Depends(conditional_get("engineer_scores"))],
 )
 async def get_latest_engineer_score(engineer_id: str):
     if not ObjectId.is_valid(engineer_id):
@@ -188,3 +368,18 @@ async def get_latest_engineer_score(engineer_id: str):
     if not document:
         return None
     return EngineerScore.model_validate(document)
+
+
+@router.get(
+    "/{engineer_id}/stats",
+    response_model=EngineerStats,
+    dependencies=[Depends(conditional_get("actions", "prompts"))],
+)
+async def get_engineer_stats(engineer_id: str):
+    """Activity counters for one engineer (all zero if nothing has been recorded)"""
+    if not ObjectId.is_valid(engineer_id):
+        raise HTTPException(status_code=400, detail="Invalid engineer ID")
+
+    db = get_database()
+    stats = await db[STATS_COLLECTION].find_one({"_id": ObjectId(engineer_id)})
+    return stats or {"_id": ObjectId(engineer_id)}
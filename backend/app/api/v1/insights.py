@@ -0,0 +1,207 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from fastapi import APIRouter
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.models.insights import InsightsSnapshot
+
+router = APIRouter()
+
+TOP_ENGINEERS = 5
+TOP_PROSPECTS = 5
+RECENT_ACTIONS = 20
+
+_cached_snapshot: Optional[Dict[str, Any]] = None
+_cached_expires_at = 0.0
+_refresh_lock = asyncio.Lock()
+
+
+def _event_counts(rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    return {str(row["_id"]): row["count"] for row in rows if row.get("_id") is not None}
+
+
+def _snapshot_pipeline() -> List[Dict[str, Any]]:
+    """One aggregation rooted at engineers; $facet always yields a single
+    document, so the uncorrelated $lookup stages after it run exactly once."""
+    return [
+        {
+            "$facet": {
+                "snapshot": [
+                    {
+                        "$group": {
+                            "_id": None,
+                            "total_engineers": {"$sum": 1},
+                            "avg_prs": {"$avg": {"$ifNull": ["$pr_count", 0]}},
+                            "avg_bugs": {"$avg": {"$ifNull": ["$bug_count", 0]}},
+                            "avg_token_cost": {"$avg": {"$ifNull": ["$token_cost", 0]}},
+                        }
+                    },
+                    {"$project": {"_id": 0}},
+                ],
+                "top_engineers": [
+                    {"$sort": {"pr_count": -1}},
+                    {"$limit": TOP_ENGINEERS},
+                    {
+                        "$project": {
+                            "_id": 0,
+                            "id": "$_id",
+                            "name": 1,
+                            "title": 1,
+                            "pr_count": {"$ifNull": ["$pr_count", 0]},
+                            "bug_count": {"$ifNull": ["$bug_count", 0]},
+                            "performance": {
+                                "$ifNull": [{"$arrayElemAt": ["$monthly_performance", -1]}, 0]
+                            },
+                        }
+                    },
+                ],
+            }
+        },
+        {
+            "$lookup": {
+                "from": "prompts",
+                "pipeline": [
+                    {
+                        "$group": {
+                            "_id": "$engineer",
+                            "prompt_count": {"$sum": 1},
+                            "total_tokens": {"$sum": {"$ifNull": ["$tokens", 0]}},
+                        }
+                    },
+                    {"$sort": {"total_tokens": -1}},
+                    {
+                        "$lookup": {
+                            "from": "engineers",
+                            "localField": "_id",
+                            "foreignField": "_id",
+                            "pipeline": [{"$project": {"name": 1}}],
+                            "as": "engineer_doc",
+                        }
+                    },
+                    {
+                        "$project": {
+                            "_id": 0,
+                            "engineer": "$_id",
+                            "name": {"$first": "$engineer_doc.name"},
+                            "prompt_count": 1,
+                            "total_tokens": 1,
+                        }
+                    },
+                ],
+                "as": "engineer_tokens",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "actions",
+                "pipeline": [{"$group": {"_id": "$event", "count": {"$sum": 1}}}],
+                "as": "action_counts",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "actions",
+                "pipeline": [
+                    {"$sort": {"date": -1}},
+                    {"$limit": RECENT_ACTIONS},
+                    {"$group": {"_id": "$event", "count": {"$sum": 1}}},
+                ],
+                "as": "recent_action_counts",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "projects",
+                "pipeline": [
+                    {"$sort": {"importance": -1}},
+                    {
+                        "$project": {
+                            "_id": 0,
+                            "id": "$_id",
+                            "title": 1,
+                            "importance": 1,
+                            "engineer_count": {"$size": {"$ifNull": ["$engineers", []]}},
+                            "prospect_count": {"$size": {"$ifNull": ["$prospects", []]}},
+                        }
+                    },
+                ],
+                "as": "project_health",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "prospects",
+                "pipeline": [
+                    {"$sort": {"performance": -1}},
+                    {"$limit": TOP_PROSPECTS},
+                    {
+                        "$project": {
+                            "_id": 0,
+                            "id": "$_id",
+                            "name": 1,
+                            "title": 1,
+                            "performance": {"$ifNull": ["$performance", 0]},
+                            "pr_count": {"$ifNull": ["$pr_count", 0]},
+                        }
+                    },
+                ],
+                "as": "pipeline",
+            }
+        },
+    ]
+
+
+async def _compute_snapshot() -> Dict[str, Any]:
+    db = get_database()
+    documents = await db.engineers.aggregate(_snapshot_pipeline()).to_list(length=1)
+    result = documents[0] if documents else {}
+
+    engineer_tokens = result.get("engineer_tokens", [])
+    total_prompts = sum(row["prompt_count"] for row in engineer_tokens)
+    total_tokens = sum(row["total_tokens"] for row in engineer_tokens)
+    snapshot = (result.get("snapshot") or [{}])[0]
+
+    return {
+        "snapshot": {
+            "total_engineers": snapshot.get("total_engineers", 0),
+            "avg_prs": round(snapshot.get("avg_prs") or 0, 1),
+            "avg_bugs": round(snapshot.get("avg_bugs") or 0, 1),
+            "avg_token_cost": round(snapshot.get("avg_token_cost") or 0),
+        },
+        "top_engineers": result.get("top_engineers", []),
+        # Skip prompts still carrying placeholder engineer references
+        "engineer_tokens": [
+            row for row in engineer_tokens if isinstance(row.get("engineer"), ObjectId)
+        ],
+        "ai_usage": {
+            "total_prompts": total_prompts,
+            "total_tokens": total_tokens,
+            "avg_tokens_per_prompt": round(total_tokens / total_prompts, 1) if total_prompts else 0.0,
+        },
+        "action_counts": _event_counts(result.get("action_counts", [])),
+        "recent_action_counts": _event_counts(result.get("recent_action_counts", [])),
+        "project_health": result.get("project_health", []),
+        "pipeline": result.get("pipeline", []),
+        "generated_at": datetime.utcnow(),
+    }
+
+
+@router.get("/snapshot", response_model=InsightsSnapshot)
+async def get_insights_snapshot():
+    """Org-wide rollups for the Stirixi AI assistant, cached server-side"""
+    global _cached_snapshot, _cached_expires_at
+
+    if _cached_snapshot is not None and _cached_expires_at > time.monotonic():
+        return _cached_snapshot
+
+    # Only one request recomputes an expired snapshot; the rest wait and reuse it
+    async with _refresh_lock:
+        if _cached_snapshot is None or _cached_expires_at <= time.monotonic():
+            _cached_snapshot = await _compute_snapshot()
+            _cached_expires_at = time.monotonic() + settings.INSIGHTS_CACHE_TTL_SECONDS
+    return _cached_snapshot
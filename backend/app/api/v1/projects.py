@@ -1,31 +1,245 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import Any, Dict, List
 from bson import ObjectId
-from app.core.database import get_database
+from pymongo import ReturnDocument
+from app.core.batch import fetch_batch
+from app.core.buckets import bucket_range, date_trunc, event_series, step, truncate
+from app.core.cache import cached, record_write
+from app.core.cascade import delete_project_cascade
+from app.core.counting import set_total_count
+from app.core.database import get_database, write_transaction
+from app.core.expansion import (
+    DEFAULT_EXPAND_LIMIT,
+    MAX_EXPAND_LIMIT,
+    expanded_projection,
+    expansion_params,
+    lookup_stage,
+)
+from app.core.projection import Projection, projected_response, projection_params
+from app.core.serialization import fast_response
+from app.core.versioning import conditional_get
+from app.models.batch import BatchRequest, BatchResult
+from app.models.dashboard import ProjectDashboard
+from app.models.expanded import ExpandedProject
 from app.models.project import Project
 
 router = APIRouter()
 
+# expand name -> (collection, localField, foreignField, sub-pipeline sort)
+PROJECT_EXPANSIONS = {
+    "engineers": ("engineers", "engineers", "_id", None),
+    "prospects": ("prospects", "prospects", "_id", {"performance": -1}),
+    "actions": ("actions", "_id", "project", {"date": -1}),
+}
 
-@router.get("/", response_model=List[Project])
-async def get_projects():
+# Summary fields joined for GET /projects/{id}/dashboard
+TEAM_SUMMARY_FIELDS = {
+    "name": 1,
+    "title": 1,
+    "github_user": 1,
+    "pr_count": 1,
+    "bug_count": 1,
+    "token_cost": 1,
+    "performance": {"$last": "$monthly_performance"},
+}
+PROSPECT_SUMMARY_FIELDS = {
+    "name": 1,
+    "title": 1,
+    "github_user": 1,
+    "date_applied": 1,
+    "pr_count": 1,
+    "bug_count": 1,
+    "performance": 1,
+}
+DEFAULT_DASHBOARD_WEEKS = 12
+MAX_DASHBOARD_WEEKS = 104
+
+
+def dashboard_pipeline(
+    project_id: ObjectId,
+    actions_limit: int,
+    start: datetime,
+    end: datetime,
+) -> List[Dict[str, Any]]:
+    """One aggregation joining everything the project page renders under `dashboard`.
+
+    Each join is a bounded $lookup served by an index: engineers and prospects
+    by _id, actions by (project, date, _id).
+    """
+    return [
+        {"$match": {"_id": project_id}},
+        {"$limit": 1},
+        {
+            "$lookup": {
+                "from": "engineers",
+                "localField": "engineers",
+                "foreignField": "_id",
+                "pipeline": [{"$limit": MAX_EXPAND_LIMIT}, {"$project": TEAM_SUMMARY_FIELDS}],
+                "as": "dashboard.team",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "prospects",
+                "localField": "prospects",
+                "foreignField": "_id",
+                "pipeline": [
+                    {"$sort": {"performance": -1}},
+                    {"$limit": MAX_EXPAND_LIMIT},
+                    {"$project": PROSPECT_SUMMARY_FIELDS},
+                ],
+                "as": "dashboard.prospects",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "actions",
+                "localField": "_id",
+                "foreignField": "project",
+                "pipeline": [{"$sort": {"date": -1}}, {"$limit": actions_limit}],
+                "as": "dashboard.recent_actions",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "actions",
+                "localField": "_id",
+                "foreignField": "project",
+                "pipeline": [
+                    {"$match": {"date": {"$gte": start, "$lt": end}}},
+                    {
+                        "$group": {
+                            "_id": {"bucket": date_trunc("$date", "week"), "event": "$event"},
+                            "count": {"$sum": 1},
+                        }
+                    },
+                ],
+                "as": "dashboard.activity",
+            }
+        },
+    ]
+
+
+@router.get(
+    "/",
+    response_model=List[Project],
+    dependencies=[Depends(conditional_get("projects"))],
+)
+@cached("projects")
+async def get_projects(
+    response: Response,
+    projection: Projection = Depends(projection_params(Project, model_fields_only=True)),
+):
     """Get all projects"""
     db = get_database()
-    projects = await db.projects.find().to_list(length=1000)
-    return projects
+    projects = await db.projects.find({}, projection).to_list(length=1000)
+    await set_total_count(response, db.projects, {})
+    return fast_response(Project, projects, projection, response=response)
 
 
-@router.get("/{project_id}", response_model=Project)
-async def get_project(project_id: str):
-    """Get a single project by ID"""
+@router.get(
+    "/{project_id}",
+    response_model=ExpandedProject,
+    dependencies=[Depends(conditional_get("actions", "engineers", "projects", "prospects"))],
+)
+@cached("projects", "engineers", "prospects", "actions", id_param="project_id")
+async def get_project(
+    project_id: str,
+    response: Response,
+    projection: Projection = Depends(projection_params(Project)),
+    expand: List[str] = Depends(expansion_params(set(PROJECT_EXPANSIONS))),
+    expand_limit: int = Query(
+        default=DEFAULT_EXPAND_LIMIT,
+        ge=1,
+        le=MAX_EXPAND_LIMIT,
+        description="Maximum number of documents resolved per expanded reference",
+    ),
+):
+    """Get a single project by ID, optionally resolving its references.
+
+    With `expand`, team members, prospects and the latest actions are joined
+    server-side in one aggregation and returned under `expanded`.
+    """
     db = get_database()
     if not ObjectId.is_valid(project_id):
         raise HTTPException(status_code=400, detail="Invalid project ID")
     
-    project = await db.projects.find_one({"_id": ObjectId(project_id)})
+    if not expand:
+        project = await db.projects.find_one({"_id": ObjectId(project_id)}, projection)
+    else:
+        pipeline = [{"$match": {"_id": ObjectId(project_id)}}, {"$limit": 1}]
+        for name in expand:
+            source, local_field, foreign_field, sort = PROJECT_EXPANSIONS[name]
+            pipeline.append(
+                lookup_stage(source, local_field, foreign_field, name, expand_limit, sort)
+            )
+        projection = expanded_projection(projection)
+        if projection:
+            pipeline.append({"$project": projection})
+        documents = await db.projects.aggregate(pipeline).to_list(length=1)
+        project = documents[0] if documents else None
+
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    return projected_response(ExpandedProject, project, projection, response=response)
+
+
+@router.get(
+    "/{project_id}/dashboard",
+    response_model=ProjectDashboard,
+    dependencies=[Depends(conditional_get("actions", "engineers", "projects", "prospects"))],
+)
+@cached("projects", "engineers", "prospects", "actions", id_param="project_id", joins_related=True)
+async def get_project_dashboard(
+    project_id: str,
+    actions_limit: int = Query(
+        default=DEFAULT_EXPAND_LIMIT,
+        ge=1,
+        le=MAX_EXPAND_LIMIT,
+        description="Number of latest actions to include",
+    ),
+    weeks: int = Query(
+        default=DEFAULT_DASHBOARD_WEEKS,
+        ge=1,
+        le=MAX_DASHBOARD_WEEKS,
+        description="Weeks of activity (including the current one) to count by event",
+    ),
+):
+    """Everything the project page renders in one round trip.
+
+    The project, team member and prospect summaries, the latest actions and
+    weekly action counts by event are joined in a single aggregation.
+    """
+    db = get_database()
+    if not ObjectId.is_valid(project_id):
+        raise HTTPException(status_code=400, detail="Invalid project ID")
+
+    now = datetime.utcnow()
+    start, end, buckets = bucket_range(step(truncate(now, "week"), "week", -(weeks - 1)), now, "week")
+    documents = await db.projects.aggregate(
+        dashboard_pipeline(ObjectId(project_id), actions_limit, start, end)
+    ).to_list(length=1)
+    if not documents:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    project = documents[0]
+    dashboard = project.pop("dashboard")
+    events, series = event_series(dashboard["activity"], buckets)
+    return {
+        "project": project,
+        "team": dashboard["team"],
+        "prospects": dashboard["prospects"],
+        "recent_actions": dashboard["recent_actions"],
+        "activity": {"bucket": "week", "start": start, "end": end, "events": events, "series": series},
+    }
+
+
+@router.post("/batch", response_model=BatchResult[Project])
+async def get_projects_batch(request: BatchRequest):
+    """Resolve many projects by ID in one query, in the order requested"""
+    db = get_database()
+    return await fetch_batch(db.projects, request.ids, "project")
 
 
 @router.post("/", response_model=Project, status_code=201)
@@ -40,9 +254,10 @@ async def create_project(project: Project):
     if project_dict.get("prospects"):
         project_dict["prospects"] = [ObjectId(pid) if isinstance(pid, str) and ObjectId.is_valid(pid) else pid for pid in project_dict["prospects"]]
     
+    # insert_one sets _id on the dict, so it is already the stored document
     result = await db.projects.insert_one(project_dict)
-    created_project = await db.projects.find_one({"_id": result.inserted_id})
-    return created_project
+    record_write("projects", result.inserted_id)
+    return project_dict
 
 
 @router.put("/{project_id}", response_model=Project)
@@ -60,26 +275,37 @@ async def update_project(project_id: str, project: Project):
     if "prospects" in update_data and update_data["prospects"]:
         update_data["prospects"] = [ObjectId(pid) if isinstance(pid, str) and ObjectId.is_valid(pid) else pid for pid in update_data["prospects"]]
     
-    result = await db.projects.update_one(
+    updated_project = await db.projects.find_one_and_update(
         {"_id": ObjectId(project_id)},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER,
     )
     
-    if result.matched_count == 0:
+    if updated_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    updated_project = await db.projects.find_one({"_id": ObjectId(project_id)})
+    record_write("projects", project_id)
     return updated_project
 
 
 @router.delete("/{project_id}", status_code=204)
-async def delete_project(project_id: str):
-    """Delete a project"""
+async def delete_project(
+    project_id: str,
+    archive: bool = Query(
+        default=False,
+        description="Move the deleted documents to *_archive collections instead of dropping them",
+    ),
+):
+    """Delete a project and clear it from its actions"""
     db = get_database()
     if not ObjectId.is_valid(project_id):
         raise HTTPException(status_code=400, detail="Invalid project ID")
     
-    result = await db.projects.delete_one({"_id": ObjectId(project_id)})
-    if result.deleted_count == 0:
+    async with write_transaction() as session:
+        removed = await delete_project_cascade(db, ObjectId(project_id), archive=archive, session=session)
+    if not removed:
         raise HTTPException(status_code=404, detail="Project not found")
+    record_write("projects", project_id)
+    if removed["actions"]:
+        record_write("actions")
     return None
@@ -1,52 +1,186 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from functools import partial
+from typing import Any, Dict, List, Optional
+from datetime import datetime
 from bson import ObjectId
-from app.core.database import get_database
+from pymongo import ReturnDocument
+from app.core.batch import fetch_batch
+from app.core.bulk import bulk_insert, bulk_request_body
+from app.core.cache import record_write
+from app.core.counting import set_total_count
+from app.core.database import get_database, write_transaction
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    apply_cursor,
+    fetch_page,
+)
+from app.core.projection import Projection, projected_response, projection_params
+from app.core.references import reference_id
+from app.core.serialization import FastJSONResponse, fast_response
+from app.core.streaming import date_range_filter, ndjson_response
+from app.core.versioning import conditional_get
+from app.core.write_hooks import (
+    DELETE_HOOK_PROJECTIONS,
+    apply_delete_hooks,
+    apply_insert_hooks,
+    apply_update_hooks,
+    inserted_hook,
+)
+from app.models.batch import BatchRequest, BatchResult
+from app.models.bulk import BulkResult
 from app.models.prompt import Prompt
+from app.services import WriteBufferFullError, prompt_write_buffer
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[Prompt])
-async def get_prompts(engineer_id: Optional[str] = None):
-    """Get all prompts, optionally filtered by engineer"""
+def prompt_document(prompt: Prompt) -> Dict[str, Any]:
+    """Build the MongoDB document for a new prompt; raises ValueError on bad references"""
+    prompt_dict = prompt.model_dump(exclude={"id"})  # Exclude id, MongoDB will generate it
+    prompt_dict["engineer"] = reference_id(prompt_dict.get("engineer"), "engineer")
+    return prompt_dict
+
+
+@router.get(
+    "/",
+    response_model=List[Prompt],
+    dependencies=[Depends(conditional_get("prompts"))],
+)
+async def get_prompts(
+    response: Response,
+    engineer_id: Optional[str] = None,
+    after: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page",
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    projection: Projection = Depends(projection_params(Prompt, model_fields_only=True)),
+):
+    """Get prompts newest first, optionally filtered by engineer.
+
+    Results are keyset-paginated on (date, _id); when more rows exist the
+    cursor for the next page is returned in the X-Next-Cursor header.
+    """
     db = get_database()
     query = {}
     if engineer_id and ObjectId.is_valid(engineer_id):
         query["engineer"] = ObjectId(engineer_id)
-    
-    prompts = await db.prompts.find(query).sort("date", -1).to_list(length=1000)
-    return prompts
+    await set_total_count(response, db.prompts, query, hints=[[("engineer", 1), ("date", -1), ("_id", -1)]])
+
+    try:
+        query = apply_cursor(query, after)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    prompts, next_cursor = await fetch_page(db.prompts, query, limit, projection)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return fast_response(Prompt, prompts, projection, response=response)
 
 
-@router.get("/{prompt_id}", response_model=Prompt)
-async def get_prompt(prompt_id: str):
+@router.get(
+    "/export",
+    summary="Stream prompts as NDJSON",
+    response_class=StreamingResponse,
+)
+async def export_prompts(
+    engineer_id: Optional[str] = None,
+    start: Optional[datetime] = Query(default=None, description="Inclusive lower bound on date"),
+    end: Optional[datetime] = Query(default=None, description="Exclusive upper bound on date"),
+):
+    """Stream every matching prompt, newest first, one JSON document per line"""
+    db = get_database()
+    query = {}
+    if engineer_id and ObjectId.is_valid(engineer_id):
+        query["engineer"] = ObjectId(engineer_id)
+    date_range = date_range_filter(start, end)
+    if date_range:
+        query["date"] = date_range
+    cursor = db.prompts.find(query).sort("date", -1)
+    return ndjson_response(cursor, "prompts.ndjson")
+
+
+@router.get(
+    "/{prompt_id}",
+    response_model=Prompt,
+    dependencies=[Depends(conditional_get("prompts"))],
+)
+async def get_prompt(
+    prompt_id: str,
+    response: Response,
+    projection: Projection = Depends(projection_params(Prompt)),
+):
     """Get a single prompt by ID"""
     db = get_database()
     if not ObjectId.is_valid(prompt_id):
         raise HTTPException(status_code=400, detail="Invalid prompt ID")
     
-    prompt = await db.prompts.find_one({"_id": ObjectId(prompt_id)})
+    prompt = await db.prompts.find_one({"_id": ObjectId(prompt_id)}, projection)
     if not prompt:
         raise HTTPException(status_code=404, detail="Prompt not found")
-    return prompt
+    return projected_response(Prompt, prompt, projection, response=response)
+
+
+@router.post("/batch", response_model=BatchResult[Prompt])
+async def get_prompts_batch(request: BatchRequest):
+    """Resolve many prompts by ID in one query, in the order requested"""
+    db = get_database()
+    return await fetch_batch(db.prompts, request.ids, "prompt")
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    openapi_extra=bulk_request_body(Prompt),
+)
+async def create_prompts_bulk(request: Request):
+    """Insert many prompts from a JSON array or an NDJSON stream (Content-Type: application/x-ndjson).
+
+    Items are validated and written in chunks with unordered insert_many;
+    each item's outcome is reported by its position in the body.
+    """
+    db = get_database()
+    result = await bulk_insert(
+        request, db.prompts, "prompts", Prompt, prompt_document,
+        after_insert=partial(inserted_hook, "prompts"),
+    )
+    # Per-item results can be large; encode them directly instead of re-validating
+    return FastJSONResponse(result)
 
 
 @router.post("/", response_model=Prompt, status_code=201)
 async def create_prompt(prompt: Prompt):
     """Create a new prompt"""
     db = get_database()
-    prompt_dict = prompt.model_dump(exclude={"id"})  # Exclude id, MongoDB will generate it
-    
-    # Convert engineer ObjectId string to ObjectId if needed
-    if isinstance(prompt_dict.get("engineer"), str) and ObjectId.is_valid(prompt_dict["engineer"]):
-        prompt_dict["engineer"] = ObjectId(prompt_dict["engineer"])
-    elif not isinstance(prompt_dict.get("engineer"), ObjectId):
-        raise HTTPException(status_code=400, detail="Invalid engineer ID")
+    try:
+        prompt_dict = prompt_document(prompt)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     
-    result = await db.prompts.insert_one(prompt_dict)
-    created_prompt = await db.prompts.find_one({"_id": result.inserted_id})
-    return created_prompt
+    if prompt_write_buffer.running:
+        # Write-behind mode: assign the id now and let the buffer group-commit it
+        prompt_dict["_id"] = ObjectId()
+        try:
+            await prompt_write_buffer.put(prompt_dict)
+        except WriteBufferFullError as exc:
+            raise HTTPException(
+                status_code=503,
+                detail=str(exc),
+                headers={"Retry-After": "1"},
+            )
+        return FastJSONResponse(prompt_dict, status_code=202)
+
+    # insert_one sets _id on the dict, so it is already the stored document
+    async with write_transaction() as session:
+        await db.prompts.insert_one(prompt_dict, session=session)
+        engineer_ids = await apply_insert_hooks(db, "prompts", [prompt_dict], session=session)
+    record_write("prompts", prompt_dict["_id"])
+    for engineer_id in engineer_ids:
+        record_write("engineers", engineer_id)
+    return prompt_dict
 
 
 @router.put("/{prompt_id}", response_model=Prompt)
@@ -58,22 +192,28 @@ async def update_prompt(prompt_id: str, prompt: Prompt):
     
     update_data = prompt.model_dump(exclude_unset=True, exclude={"id"})
     
-    # Convert engineer ObjectId string to ObjectId if provided
     if "engineer" in update_data:
-        if isinstance(update_data["engineer"], str) and ObjectId.is_valid(update_data["engineer"]):
-            update_data["engineer"] = ObjectId(update_data["engineer"])
-        elif not isinstance(update_data["engineer"], ObjectId):
-            raise HTTPException(status_code=400, detail="Invalid engineer ID")
+        try:
+            update_data["engineer"] = reference_id(update_data["engineer"], "engineer")
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
     
-    result = await db.prompts.update_one(
-        {"_id": ObjectId(prompt_id)},
-        {"$set": update_data}
-    )
+    async with write_transaction() as session:
+        # The previous version drives the derived-data hooks; $set gives the new one
+        previous_prompt = await db.prompts.find_one_and_update(
+            {"_id": ObjectId(prompt_id)},
+            {"$set": update_data},
+            return_document=ReturnDocument.BEFORE,
+            session=session,
+        )
+        if previous_prompt is None:
+            raise HTTPException(status_code=404, detail="Prompt not found")
+        updated_prompt = {**previous_prompt, **update_data}
+        engineer_ids = await apply_update_hooks(db, "prompts", previous_prompt, updated_prompt, session=session)
     
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Prompt not found")
-    
-    updated_prompt = await db.prompts.find_one({"_id": ObjectId(prompt_id)})
+    record_write("prompts", prompt_id)
+    for engineer_id in engineer_ids:
+        record_write("engineers", engineer_id)
     return updated_prompt
 
 
@@ -84,7 +224,16 @@ async def delete_prompt(prompt_id: str):
     if not ObjectId.is_valid(prompt_id):
         raise HTTPException(status_code=400, detail="Invalid prompt ID")
     
-    result = await db.prompts.delete_one({"_id": ObjectId(prompt_id)})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Prompt not found")
+    async with write_transaction() as session:
+        deleted = await db.prompts.find_one_and_delete(
+            {"_id": ObjectId(prompt_id)},
+            projection=DELETE_HOOK_PROJECTIONS["prompts"],
+            session=session,
+        )
+        if deleted is None:
+            raise HTTPException(status_code=404, detail="Prompt not found")
+        engineer_ids = await apply_delete_hooks(db, "prompts", deleted, session=session)
+    record_write("prompts", prompt_id)
+    for engineer_id in engineer_ids:
+        record_write("engineers", engineer_id)
     return None
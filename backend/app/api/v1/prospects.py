@@ -1,31 +1,65 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from typing import List
 from bson import ObjectId
-from app.core.database import get_database
+from pymongo import ReturnDocument
+from app.core.batch import fetch_batch
+from app.core.cache import cached, record_write
+from app.core.cascade import delete_prospect_cascade
+from app.core.counting import set_total_count
+from app.core.database import get_database, write_transaction
+from app.core.projection import Projection, projected_response, projection_params
+from app.core.serialization import fast_response
+from app.core.versioning import conditional_get
+from app.models.batch import BatchRequest, BatchResult
 from app.models.prospect import Prospect
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[Prospect])
-async def get_prospects():
+@router.get(
+    "/",
+    response_model=List[Prospect],
+    dependencies=[Depends(conditional_get("prospects"))],
+)
+@cached("prospects")
+async def get_prospects(
+    response: Response,
+    projection: Projection = Depends(projection_params(Prospect, model_fields_only=True)),
+):
     """Get all prospects"""
     db = get_database()
-    prospects = await db.prospects.find().to_list(length=1000)
-    return prospects
+    prospects = await db.prospects.find({}, projection).to_list(length=1000)
+    await set_total_count(response, db.prospects, {})
+    return fast_response(Prospect, prospects, projection, response=response)
 
 
-@router.get("/{prospect_id}", response_model=Prospect)
-async def get_prospect(prospect_id: str):
+@router.get(
+    "/{prospect_id}",
+    response_model=Prospect,
+    dependencies=[Depends(conditional_get("prospects"))],
+)
+@cached("prospects", id_param="prospect_id")
+async def get_prospect(
+    prospect_id: str,
+    response: Response,
+    projection: Projection = Depends(projection_params(Prospect)),
+):
     """Get a single prospect by ID"""
     db = get_database()
     if not ObjectId.is_valid(prospect_id):
         raise HTTPException(status_code=400, detail="Invalid prospect ID")
     
-    prospect = await db.prospects.find_one({"_id": ObjectId(prospect_id)})
+    prospect = await db.prospects.find_one({"_id": ObjectId(prospect_id)}, projection)
     if not prospect:
         raise HTTPException(status_code=404, detail="Prospect not found")
-    return prospect
+    return projected_response(Prospect, prospect, projection, response=response)
+
+
+@router.post("/batch", response_model=BatchResult[Prospect])
+async def get_prospects_batch(request: BatchRequest):
+    """Resolve many prospects by ID in one query, in the order requested"""
+    db = get_database()
+    return await fetch_batch(db.prospects, request.ids, "prospect")
 
 
 @router.post("/", response_model=Prospect, status_code=201)
@@ -34,9 +68,10 @@ async def create_prospect(prospect: Prospect):
     db = get_database()
     prospect_dict = prospect.model_dump(exclude={"id"})  # Exclude id, MongoDB will generate it
     
+    # insert_one sets _id on the dict, so it is already the stored document
     result = await db.prospects.insert_one(prospect_dict)
-    created_prospect = await db.prospects.find_one({"_id": result.inserted_id})
-    return created_prospect
+    record_write("prospects", result.inserted_id)
+    return prospect_dict
 
 
 @router.put("/{prospect_id}", response_model=Prospect)
@@ -48,26 +83,37 @@ async def update_prospect(prospect_id: str, prospect: Prospect):
     
     update_data = prospect.model_dump(exclude_unset=True, exclude={"id"})
     
-    result = await db.prospects.update_one(
+    updated_prospect = await db.prospects.find_one_and_update(
         {"_id": ObjectId(prospect_id)},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER,
     )
     
-    if result.matched_count == 0:
+    if updated_prospect is None:
         raise HTTPException(status_code=404, detail="Prospect not found")
     
-    updated_prospect = await db.prospects.find_one({"_id": ObjectId(prospect_id)})
+    record_write("prospects", prospect_id)
     return updated_prospect
 
 
 @router.delete("/{prospect_id}", status_code=204)
-async def delete_prospect(prospect_id: str):
-    """Delete a prospect"""
+async def delete_prospect(
+    prospect_id: str,
+    archive: bool = Query(
+        default=False,
+        description="Move the deleted documents to *_archive collections instead of dropping them",
+    ),
+):
+    """Delete a prospect and pull it from every project's prospects"""
     db = get_database()
     if not ObjectId.is_valid(prospect_id):
         raise HTTPException(status_code=400, detail="Invalid prospect ID")
     
-    result = await db.prospects.delete_one({"_id": ObjectId(prospect_id)})
-    if result.deleted_count == 0:
+    async with write_transaction() as session:
+        removed = await delete_prospect_cascade(db, ObjectId(prospect_id), archive=archive, session=session)
+    if not removed:
         raise HTTPException(status_code=404, detail="Prospect not found")
+    record_write("prospects", prospect_id)
+    for project_id in removed["project_ids"]:
+        record_write("projects", project_id)
     return None
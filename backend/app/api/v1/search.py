@@ -0,0 +1,137 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from app.core.database import get_database
+from app.core.pagination import InvalidCursorError, decode_score_cursor, encode_score_cursor
+from app.core.streaming import date_range_filter
+from app.core.versioning import conditional_get
+from app.models.search import SearchHit
+
+router = APIRouter()
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# type -> (collection, fields returned with each hit)
+SEARCH_TARGETS = {
+    "prompt": ("prompts", ["date", "engineer", "text", "model"]),
+    "action": ("actions", ["date", "engineer", "project", "title", "description", "event"]),
+}
+
+
+def _parse_types(types: Optional[str]) -> List[str]:
+    if not types:
+        return list(SEARCH_TARGETS)
+    requested = [name.strip().rstrip("s") for name in types.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in SEARCH_TARGETS]
+    if unknown or not requested:
+        raise HTTPException(status_code=400, detail="types must be a comma separated subset of prompts,actions")
+    return requested
+
+
+def _object_id(value: Optional[str], label: str) -> Optional[ObjectId]:
+    if value is None:
+        return None
+    if not ObjectId.is_valid(value):
+        raise HTTPException(status_code=400, detail=f"Invalid {label} ID")
+    return ObjectId(value)
+
+
+def _search_pipeline(
+    kind: str,
+    text: str,
+    query: Dict[str, Any],
+    position: Optional[Tuple[float, ObjectId]],
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """$text match ranked by (textScore, _id), resuming strictly after `position`"""
+    _, fields = SEARCH_TARGETS[kind]
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": {"$text": {"$search": text}, **query}},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+    ]
+    if position is not None:
+        score, document_id = position
+        pipeline.append({
+            "$match": {
+                "$or": [
+                    {"score": {"$lt": score}},
+                    {"score": score, "_id": {"$lt": document_id}},
+                ]
+            }
+        })
+    pipeline += [
+        # $sort + $limit coalesce into a top-k sort over the text matches
+        {"$sort": {"score": -1, "_id": -1}},
+        {"$limit": limit},
+        {"$project": {"score": 1, **{field: 1 for field in fields}, "type": {"$literal": kind}}},
+    ]
+    return pipeline
+
+
+@router.get(
+    "/",
+    response_model=List[SearchHit],
+    dependencies=[Depends(conditional_get("prompts", "actions"))],
+)
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, description="Text search terms; quote phrases, prefix - to exclude"),
+    types: Optional[str] = Query(default=None, description="Comma separated subset of prompts,actions"),
+    engineer_id: Optional[str] = None,
+    project_id: Optional[str] = Query(default=None, description="Only actions carry a project"),
+    start: Optional[datetime] = Query(default=None, description="Inclusive lower bound on date"),
+    end: Optional[datetime] = Query(default=None, description="Exclusive upper bound on date"),
+    after: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page",
+    ),
+    limit: int = Query(default=DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+):
+    """Full-text search over prompt text and action titles/descriptions.
+
+    Hits from both collections are merged by relevance (text score, then
+    _id); when more exist the cursor for the next page is returned in the
+    X-Next-Cursor header.
+    """
+    db = get_database()
+    kinds = _parse_types(types)
+
+    query: Dict[str, Any] = {}
+    engineer = _object_id(engineer_id, "engineer")
+    if engineer is not None:
+        query["engineer"] = engineer
+    date_range = date_range_filter(start, end)
+    if date_range:
+        query["date"] = date_range
+    project = _object_id(project_id, "project")
+    if project is not None:
+        # Prompts have no project, so a project filter narrows the search to actions
+        kinds = [kind for kind in kinds if kind == "action"]
+        query["project"] = project
+
+    try:
+        position = decode_score_cursor(after) if after else None
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Each collection contributes at most limit + 1 rows; the merged head is the global page
+    results = await asyncio.gather(*(
+        db[SEARCH_TARGETS[kind][0]]
+        .aggregate(_search_pipeline(kind, q, query, position, limit + 1))
+        .to_list(length=limit + 1)
+        for kind in kinds
+    ))
+    hits = sorted(
+        (hit for rows in results for hit in rows),
+        key=lambda hit: (hit["score"], hit["_id"]),
+        reverse=True,
+    )
+    if len(hits) > limit:
+        hits = hits[:limit]
+        response.headers["X-Next-Cursor"] = encode_score_cursor(hits[-1]["score"], hits[-1]["_id"])
+    return hits
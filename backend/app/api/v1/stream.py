@@ -0,0 +1,87 @@
+import asyncio
+from typing import AsyncIterator, Optional
+
+from bson import ObjectId
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.services import EventStreamUnavailableError, event_hub
+from app.services.event_stream import OVERFLOW, Subscription
+
+router = APIRouter()
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def _object_id(value: Optional[str], label: str) -> Optional[ObjectId]:
+    if value is None:
+        return None
+    if not ObjectId.is_valid(value):
+        raise HTTPException(status_code=400, detail=f"Invalid {label} ID")
+    return ObjectId(value)
+
+
+async def _iter_events(request: Request, subscription: Subscription) -> AsyncIterator[bytes]:
+    # Ask EventSource clients to wait a few seconds before reconnecting
+    yield b"retry: 3000\n\n"
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=settings.EVENT_STREAM_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                # Comment line keeps proxies from closing an idle connection
+                yield b": keep-alive\n\n"
+                continue
+            yield message
+            if message is OVERFLOW or (subscription.closed and subscription.queue.empty()):
+                break
+    finally:
+        event_hub.unsubscribe(subscription)
+
+
+@router.get(
+    "/events",
+    summary="Live change feed for actions, prompts and engineer scores (Server-Sent Events)",
+    response_class=StreamingResponse,
+)
+async def stream_events(
+    request: Request,
+    engineer_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    last_event_id: Optional[str] = Query(
+        default=None,
+        description="Resume after this event id (EventSource sends the Last-Event-ID header automatically)",
+    ),
+    last_event_id_header: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+):
+    """Stream inserts, updates and deletes as they happen, one `change` event each.
+
+    Each event id is the change stream resume token; reconnecting with it
+    replays anything missed while it is still in the server's replay buffer,
+    otherwise a `reset` event tells the client to refetch. Connected clients
+    also get `reset` if the server's change stream had to restart after
+    losing its place in the oplog. An `overflow` event means the client
+    fell too far behind and should reconnect.
+    Deletes carry no document, so they only reach unfiltered subscribers.
+    """
+    engineer = _object_id(engineer_id, "engineer")
+    project = _object_id(project_id, "project")
+    try:
+        subscription = await event_hub.subscribe(
+            engineer=engineer,
+            project=project,
+            last_event_id=last_event_id_header or last_event_id,
+        )
+    except EventStreamUnavailableError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+
+    return StreamingResponse(
+        _iter_events(request, subscription),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.buckets import BucketUnit, bucket_range, date_trunc, truncate
+from app.core.database import get_database
+from app.core.usage import USAGE_COLLECTION, token_cost
+from app.core.versioning import conditional_get
+from app.models.usage import TokenUsage
+
+router = APIRouter()
+
+USAGE_DIMENSIONS = ("engineer", "model")
+
+
+def _parse_group_by(group_by: Optional[str]) -> List[str]:
+    if group_by is None:
+        return list(USAGE_DIMENSIONS)
+    dimensions = [name.strip() for name in group_by.split(",") if name.strip()]
+    if any(name not in USAGE_DIMENSIONS for name in dimensions):
+        raise HTTPException(status_code=400, detail="group_by must be a comma separated subset of engineer,model")
+    return [name for name in USAGE_DIMENSIONS if name in dimensions]
+
+
+def _day_bounds(start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+    """Rollups are daily, so widen [start, end) to whole days"""
+    end_day = truncate(end, "day")
+    if end_day < end:
+        end_day += timedelta(days=1)
+    return truncate(start, "day"), end_day
+
+
+@router.get(
+    "/tokens",
+    response_model=TokenUsage,
+    dependencies=[Depends(conditional_get("prompts"))],
+)
+async def get_token_usage(
+    engineer_id: Optional[str] = None,
+    model: Optional[str] = None,
+    start: Optional[datetime] = Query(default=None, description="Inclusive lower bound, rounded down to the day (default: 30 buckets back)"),
+    end: Optional[datetime] = Query(default=None, description="Exclusive upper bound, rounded up to the day (default: now)"),
+    bucket: BucketUnit = Query(default="day", description="Bucket size"),
+    group_by: Optional[str] = Query(default=None, description="Comma separated subset of engineer,model (default: both; empty for totals per bucket)"),
+):
+    """Prompt count, tokens and dollar cost per time bucket, optionally per engineer and model.
+
+    Reads the daily rollups in prompt_usage_daily (one row per engineer,
+    model and day), which the prompt write handlers keep current, so a
+    year-long range touches hundreds of rollup rows instead of every prompt.
+    """
+    db = get_database()
+    dimensions = _parse_group_by(group_by)
+    try:
+        start, end, _ = bucket_range(start, end, bucket)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    start, end = _day_bounds(start, end)
+
+    query: Dict[str, Any] = {"day": {"$gte": start, "$lt": end}}
+    if engineer_id is not None:
+        if not ObjectId.is_valid(engineer_id):
+            raise HTTPException(status_code=400, detail="Invalid engineer ID")
+        query["engineer"] = ObjectId(engineer_id)
+    if model is not None:
+        query["model"] = model
+
+    # Always group by model as well: cost depends on each model's price
+    group_key: Dict[str, Any] = {"start": date_trunc("$day", bucket), "model": "$model"}
+    if "engineer" in dimensions:
+        group_key["engineer"] = "$engineer"
+    rows = await db[USAGE_COLLECTION].aggregate([
+        {"$match": query},
+        {"$group": {"_id": group_key, "prompts": {"$sum": "$prompts"}, "tokens": {"$sum": "$tokens"}}},
+        # Rows whose prompts were all deleted stay behind with zero counts
+        {"$match": {"prompts": {"$gt": 0}}},
+    ]).to_list(length=None)
+
+    series: Dict[tuple, Dict[str, Any]] = {}
+    totals = {"prompts": 0, "tokens": 0, "cost": 0.0}
+    for row in rows:
+        key = row["_id"]
+        cost = token_cost(key["model"], row["tokens"])
+        entry = series.setdefault(
+            (key["start"],) + tuple(str(key.get(name)) for name in dimensions),
+            {
+                "start": key["start"],
+                **{name: key.get(name) for name in dimensions},
+                "prompts": 0,
+                "tokens": 0,
+                "cost": 0.0,
+            },
+        )
+        for target in (entry, totals):
+            target["prompts"] += row["prompts"]
+            target["tokens"] += row["tokens"]
+            target["cost"] += cost
+
+    return {
+        "bucket": bucket,
+        "start": start,
+        "end": end,
+        "group_by": dimensions,
+        "totals": totals,
+        "series": [series[key] for key in sorted(series)],
+    }
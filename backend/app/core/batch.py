@@ -0,0 +1,36 @@
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+
+async def fetch_batch(collection, ids: List[str], label: str) -> Dict[str, Any]:
+    """Resolve ids with a single $in query, preserving request order and reporting misses"""
+    if len(ids) > settings.BATCH_LOOKUP_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size exceeds maximum of {settings.BATCH_LOOKUP_MAX_IDS} ids",
+        )
+
+    invalid = [value for value in ids if not ObjectId.is_valid(value)]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid {label} ID(s): {', '.join(invalid)}",
+        )
+
+    # Deduplicate while keeping the first-seen order
+    ordered_ids = list(dict.fromkeys(ObjectId(value) for value in ids))
+    if not ordered_ids:
+        return {"items": [], "missing": []}
+
+    documents = await collection.find({"_id": {"$in": ordered_ids}}).to_list(
+        length=len(ordered_ids)
+    )
+    by_id = {document["_id"]: document for document in documents}
+
+    items = [by_id[oid] for oid in ordered_ids if oid in by_id]
+    missing = [str(oid) for oid in ordered_ids if oid not in by_id]
+    return {"items": items, "missing": missing}
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+# Time bucket sizes accepted by the bucketed aggregation endpoints
+BucketUnit = Literal["day", "week", "month"]
+
+# Buckets returned when the caller gives no start date
+DEFAULT_BUCKETS = 30
+# Upper bound on buckets per response so a wide range cannot explode the payload
+MAX_BUCKETS = 1000
+
+
+def as_utc(value: datetime) -> datetime:
+    """Stored dates are naive UTC; convert aware query parameters to match"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def truncate(value: datetime, unit: BucketUnit) -> datetime:
+    """Python twin of date_trunc(): start of the bucket containing `value` (weeks start Monday)"""
+    day = datetime(value.year, value.month, value.day)
+    if unit == "week":
+        return day - timedelta(days=day.weekday())
+    if unit == "month":
+        return day.replace(day=1)
+    return day
+
+
+def step(value: datetime, unit: BucketUnit, count: int = 1) -> datetime:
+    """Move a bucket start forward (or back, for negative counts) by whole buckets"""
+    if unit == "month":
+        months = value.year * 12 + value.month - 1 + count
+        return value.replace(year=months // 12, month=months % 12 + 1)
+    return value + timedelta(days=count * (7 if unit == "week" else 1))
+
+
+def date_trunc(field: str, unit: BucketUnit) -> Dict[str, Any]:
+    """$dateTrunc expression matching truncate() (MongoDB 5.0+)"""
+    expression: Dict[str, Any] = {"date": field, "unit": unit}
+    if unit == "week":
+        expression["startOfWeek"] = "monday"
+    return {"$dateTrunc": expression}
+
+
+def bucket_range(
+    start: Optional[datetime],
+    end: Optional[datetime],
+    unit: BucketUnit,
+) -> Tuple[datetime, datetime, List[datetime]]:
+    """Resolve a [start, end) query range and list every bucket start it covers.
+
+    Defaults to the last DEFAULT_BUCKETS buckets up to now; raises ValueError
+    for an empty range or one spanning more than MAX_BUCKETS buckets.
+    """
+    end = as_utc(end) if end else datetime.utcnow()
+    start = as_utc(start) if start else step(truncate(end, unit), unit, -(DEFAULT_BUCKETS - 1))
+    if start >= end:
+        raise ValueError("start must be before end")
+
+    buckets = []
+    current = truncate(start, unit)
+    while current < end:
+        buckets.append(current)
+        if len(buckets) > MAX_BUCKETS:
+            raise ValueError(f"Range spans more than {MAX_BUCKETS} {unit} buckets")
+        current = step(current, unit)
+    return start, end, buckets
+
+
+def event_series(rows: List[Dict[str, Any]], buckets: List[datetime]) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Zero-fill `{_id: {bucket, event}, count}` group rows into one entry per bucket.
+
+    Returns the sorted event names and the series in HistogramBucket shape.
+    """
+    counts: Dict[datetime, Dict[str, int]] = {}
+    for row in rows:
+        counts.setdefault(row["_id"]["bucket"], {})[str(row["_id"]["event"])] = row["count"]
+    events = sorted({name for bucket_counts in counts.values() for name in bucket_counts})
+    series = []
+    for bucket_start in buckets:
+        bucket_counts = counts.get(bucket_start, {})
+        series.append({
+            "start": bucket_start,
+            "total": sum(bucket_counts.values()),
+            "counts": {name: bucket_counts.get(name, 0) for name in events},
+        })
+    return events, series
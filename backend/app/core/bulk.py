@@ -0,0 +1,202 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+import orjson
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+from pymongo.errors import BulkWriteError
+
+from app.core.cache import record_write
+from app.core.config import settings
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+
+AfterInsert = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+
+def bulk_request_body(model: Type[BaseModel]) -> Dict[str, Any]:
+    """OpenAPI description of the two accepted request body shapes"""
+    item_ref = {"$ref": f"#/components/schemas/{model.__name__}"}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": item_ref}},
+                "application/x-ndjson": {
+                    "schema": {"type": "string", "description": f"One {model.__name__} JSON object per line"}
+                },
+            },
+        }
+    }
+
+
+async def _iter_ndjson(request: Request) -> AsyncIterator[bytes]:
+    """Yield non-blank lines from a streamed body without buffering it whole"""
+    pending = b""
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if pending.strip():
+        yield pending
+
+
+async def _iter_json_array(request: Request) -> AsyncIterator[Any]:
+    try:
+        items = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array")
+    if len(items) > settings.BULK_INGEST_MAX_ITEMS:
+        # The whole array is in memory, so reject it before anything is written
+        raise HTTPException(status_code=413, detail=_limit_message())
+    for item in items:
+        yield item
+
+
+async def _iter_items(request: Request) -> AsyncIterator[Tuple[Any, Optional[str]]]:
+    """Yield (raw item, parse error) pairs in body order"""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_CONTENT_TYPES:
+        async for line in _iter_ndjson(request):
+            try:
+                yield orjson.loads(line), None
+            except orjson.JSONDecodeError as exc:
+                yield None, f"Invalid JSON: {exc}"
+    else:
+        async for item in _iter_json_array(request):
+            yield item, None
+
+
+def _limit_message() -> str:
+    return f"Bulk requests are limited to {settings.BULK_INGEST_MAX_ITEMS} items"
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+async def _insert_chunk(
+    collection,
+    positions: List[int],
+    documents: List[Dict[str, Any]],
+    after_insert: Optional[AfterInsert] = None,
+) -> List[Dict[str, Any]]:
+    """insert_many(ordered=False) and map write errors back to body positions"""
+    failed = {}
+    try:
+        await collection.insert_many(documents, ordered=False)
+    except BulkWriteError as exc:
+        for error in exc.details.get("writeErrors", []):
+            failed[error["index"]] = error.get("errmsg", "Write failed")
+    results = []
+    for offset, (position, document) in enumerate(zip(positions, documents)):
+        if offset in failed:
+            results.append({"index": position, "error": failed[offset]})
+        else:
+            results.append({"index": position, "id": document["_id"]})
+    if after_insert is not None and len(failed) < len(documents):
+        await after_insert([document for offset, document in enumerate(documents) if offset not in failed])
+    return results
+
+
+async def bulk_insert(
+    request: Request,
+    collection,
+    collection_name: str,
+    model: Type[BaseModel],
+    to_document: Callable[[BaseModel], Dict[str, Any]],
+    after_insert: Optional[AfterInsert] = None,
+) -> Dict[str, Any]:
+    """Validate a JSON array or NDJSON body in chunks and write it with unordered insert_many.
+
+    While one chunk is being written the next one is parsed and validated,
+    so validation and database I/O overlap. `to_document` may raise
+    ValueError to reject an item; `after_insert` receives each chunk's
+    successfully inserted documents.
+
+    A JSON array over BULK_INGEST_MAX_ITEMS is rejected with 413 before any
+    write. An NDJSON stream is only known to be too long once earlier chunks
+    are committed, so its 413 detail reports what was inserted.
+    """
+    chunk_size = settings.BULK_INGEST_CHUNK_SIZE
+    results: List[Dict[str, Any]] = []
+    positions: List[int] = []
+    documents: List[Dict[str, Any]] = []
+    in_flight: Optional[asyncio.Task] = None
+    received = 0
+    over_limit = False
+
+    async def flush():
+        nonlocal in_flight, positions, documents
+        if in_flight is not None:
+            results.extend(await in_flight)
+            in_flight = None
+        if documents:
+            in_flight = asyncio.create_task(_insert_chunk(collection, positions, documents, after_insert))
+            positions, documents = [], []
+
+    try:
+        async for raw, parse_error in _iter_items(request):
+            if received >= settings.BULK_INGEST_MAX_ITEMS:
+                over_limit = True
+                break
+            position = received
+            received += 1
+            if parse_error:
+                results.append({"index": position, "error": parse_error})
+                continue
+            try:
+                documents.append(to_document(model.model_validate(raw)))
+                positions.append(position)
+            except ValidationError as exc:
+                results.append({"index": position, "error": _validation_message(exc)})
+            except ValueError as exc:
+                results.append({"index": position, "error": str(exc)})
+            if len(documents) >= chunk_size:
+                await flush()
+        if over_limit:
+            # Validated items that were not sent yet are dropped, not written
+            results.extend({"index": position, "error": _limit_message()} for position in positions)
+            positions, documents = [], []
+        await flush()
+        if in_flight is not None:
+            results.extend(await in_flight)
+            in_flight = None
+    finally:
+        if in_flight is not None and not in_flight.done():
+            # Let an already started write finish before the request unwinds
+            await asyncio.wait([in_flight])
+            if not in_flight.cancelled() and in_flight.exception() is None:
+                results.extend(in_flight.result())
+        # Invalidate caches for whatever was committed, even when the request fails
+        if any("id" in result for result in results):
+            record_write(collection_name)
+
+    results.sort(key=lambda result: result["index"])
+    inserted = sum(1 for result in results if "id" in result)
+    summary = {
+        "received": received,
+        "inserted": inserted,
+        "failed": received - inserted,
+        "results": results,
+    }
+    if over_limit:
+        raise HTTPException(
+            status_code=413,
+            detail={
+                "message": _limit_message(),
+                **summary,
+                "results": [
+                    {**result, "id": str(result["id"])} if "id" in result else result
+                    for result in results
+                ],
+            },
+        )
+    return summary
@@ -0,0 +1,192 @@
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from fastapi import Response
+
+from app.core.config import settings
+from app.core.versioning import collection_versions
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn handler arguments (dicts, lists) into a hashable cache key component"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    return value if isinstance(value, Hashable) else repr(value)
+
+
+def cache_key(*parts: Any) -> Hashable:
+    """Build a response_cache key from arbitrary (possibly unhashable) parts"""
+    return tuple(_freeze(part) for part in parts)
+
+
+# Handler-set headers that belong to the cached payload and are replayed on hits
+REPLAYED_HEADERS = ("x-total-count", "x-next-cursor")
+
+
+class ResponseCache:
+    """Bounded in-memory cache with per-entry TTL, LRU eviction and tag invalidation"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, value, tags); most recently used entries at the end
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Set[str]]]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def set(self, key: Hashable, value: Any, tags: Set[str]) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, *tags: str) -> None:
+        for tag in tags:
+            for key in self._tags.pop(tag, set()):
+                if key in self._entries:
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+
+def document_tag(collection: str, document_id: Any) -> str:
+    return f"{collection}:{document_id}"
+
+
+def record_write(collection: str, document_id: Optional[Any] = None) -> None:
+    """Call after every successful write: bumps the ETag version and drops stale cache entries.
+
+    Listings of the collection are always invalidated; detail entries only
+    for the written document.
+    """
+    collection_versions.bump(collection)
+    tags = [collection]
+    if document_id is not None:
+        tags.append(document_tag(collection, document_id))
+    response_cache.invalidate(*tags)
+
+
+def cached(
+    collection: str,
+    *related: str,
+    id_param: Optional[str] = None,
+    joins_related: bool = False,
+) -> Callable:
+    """Opt a read endpoint into the response cache.
+
+    Entries are keyed by the endpoint and its arguments (path and query
+    parameters, projection, expand). Listings (no `id_param`) are tagged
+    with `collection`; detail routes with the single document, plus the
+    `related` collections when the request expands references into them.
+    With `joins_related`, routes that always join `related` (listings
+    included) are tagged with them unconditionally.
+    Of the handler-set headers only REPLAYED_HEADERS are stored and
+    replayed on hits; everything else must come from dependencies (ETag).
+    Results are not stored when a tagged collection was written while the
+    handler ran.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            response = kwargs.get("response")
+            key = (
+                func.__module__,
+                func.__qualname__,
+                _freeze({name: value for name, value in kwargs.items() if name != "response"}),
+            )
+            found, value = response_cache.get(key)
+            if found:
+                if isinstance(value, tuple):
+                    body, status_code, media_type, payload_headers = value
+                    headers = dict(response.headers) if response is not None else {}
+                    headers.update(payload_headers)
+                    return Response(body, status_code=status_code, media_type=media_type, headers=headers)
+                return value
+
+            if id_param is None:
+                tags = {collection}
+                if joins_related:
+                    tags.update(related)
+            else:
+                tags = {document_tag(collection, kwargs[id_param])}
+                if joins_related or kwargs.get("expand"):
+                    tags.update(related)
+            # A write during the await must not be overwritten by the result it made stale
+            sources = tuple(sorted({tag.split(":", 1)[0] for tag in tags}))
+            versions = collection_versions.snapshot(sources)
+
+            result = await func(*args, **kwargs)
+
+            if collection_versions.snapshot(sources) != versions:
+                return result
+            if isinstance(result, Response):
+                # Cache the rendered body, not the Response (most of its headers are per request)
+                payload_headers = {
+                    name: result.headers[name] for name in REPLAYED_HEADERS if name in result.headers
+                }
+                response_cache.set(
+                    key, (result.body, result.status_code, result.media_type, payload_headers), tags
+                )
+            else:
+                response_cache.set(key, result, tags)
+            return result
+
+        return wrapper
+
+    return decorator
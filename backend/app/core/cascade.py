@@ -0,0 +1,108 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from pymongo import ReplaceOne
+
+from app.core.config import settings
+from app.core.engineer_stats import STATS_COLLECTION
+from app.core.rankings import remove_engineer_rankings
+from app.core.usage import USAGE_COLLECTION
+
+# Archived documents go to "<collection>_archive" with an `archived_at` timestamp
+ARCHIVE_SUFFIX = "_archive"
+
+
+async def _archive(db, collection_name: str, query: Dict[str, Any], session=None) -> None:
+    """Copy matching documents to the archive collection in chunks (idempotent by _id)"""
+    archive = db[collection_name + ARCHIVE_SUFFIX]
+    archived_at = datetime.utcnow()
+    chunk = []
+    async for document in db[collection_name].find(query, session=session):
+        document["archived_at"] = archived_at
+        chunk.append(ReplaceOne({"_id": document["_id"]}, document, upsert=True))
+        if len(chunk) >= settings.BULK_INGEST_CHUNK_SIZE:
+            await archive.bulk_write(chunk, ordered=False, session=session)
+            chunk = []
+    if chunk:
+        await archive.bulk_write(chunk, ordered=False, session=session)
+
+
+async def _remove(db, collection_name: str, query: Dict[str, Any], archive: bool, session=None) -> int:
+    if archive:
+        await _archive(db, collection_name, query, session=session)
+    result = await db[collection_name].delete_many(query, session=session)
+    return result.deleted_count
+
+
+async def _pull_from_projects(db, field: str, document_id: ObjectId, session=None) -> List[ObjectId]:
+    """$pull an id from every project's `field` array; returns the projects modified"""
+    project_ids = await db.projects.distinct("_id", {field: document_id}, session=session)
+    if project_ids:
+        await db.projects.update_many(
+            {"_id": {"$in": project_ids}},
+            {"$pull": {field: document_id}},
+            session=session,
+        )
+    return project_ids
+
+
+async def delete_engineer_cascade(
+    db,
+    engineer_id: ObjectId,
+    archive: bool = False,
+    session=None,
+) -> Dict[str, Any]:
+    """Delete (or archive) an engineer with their actions and prompts.
+
+    The engineer is pulled from project teams and their derived stats,
+    usage rollups and leaderboard entries are dropped. Every step is an
+    indexed bulk operation, so pass a transaction session to make the
+    cascade atomic. Engineer scores are kept: they mirror records anchored
+    on Solana. Returns the per collection counts plus the ids of the
+    projects modified, or an empty dict when the engineer does not exist.
+    """
+    if not await _remove(db, "engineers", {"_id": engineer_id}, archive, session=session):
+        return {}
+    project_ids = await _pull_from_projects(db, "engineers", engineer_id, session=session)
+    actions = await _remove(db, "actions", {"engineer": engineer_id}, archive, session=session)
+    prompts = await _remove(db, "prompts", {"engineer": engineer_id}, archive, session=session)
+    await db[STATS_COLLECTION].delete_one({"_id": engineer_id}, session=session)
+    await db[USAGE_COLLECTION].delete_many({"engineer": engineer_id}, session=session)
+    await remove_engineer_rankings(db, engineer_id, session=session)
+    return {"actions": actions, "prompts": prompts, "project_ids": project_ids}
+
+
+async def delete_project_cascade(
+    db,
+    project_id: ObjectId,
+    archive: bool = False,
+    session=None,
+) -> Dict[str, Any]:
+    """Delete (or archive) a project and detach its actions.
+
+    Actions stay (they are the engineers' history and feed their stats) with
+    `project` set to null. Returns the number of actions detached, or an
+    empty dict when the project does not exist.
+    """
+    if not await _remove(db, "projects", {"_id": project_id}, archive, session=session):
+        return {}
+    result = await db.actions.update_many(
+        {"project": project_id},
+        {"$set": {"project": None}},
+        session=session,
+    )
+    return {"actions": result.modified_count}
+
+
+async def delete_prospect_cascade(
+    db,
+    prospect_id: ObjectId,
+    archive: bool = False,
+    session=None,
+) -> Dict[str, Any]:
+    """Delete (or archive) a prospect and pull it from every project's prospects"""
+    if not await _remove(db, "prospects", {"_id": prospect_id}, archive, session=session):
+        return {}
+    project_ids = await _pull_from_projects(db, "prospects", prospect_id, session=session)
+    return {"project_ids": project_ids}
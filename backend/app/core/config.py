@@ -1,6 +1,6 @@
 import json
 from pathlib import Path
-from typing import List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -31,6 +31,8 @@ class Settings(BaseSettings):
     # MongoDB
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "stirixi_ai_atl"
+    # Multi-document writes run in a transaction (requires a replica set or Atlas)
+    MONGODB_TRANSACTIONS: bool = False
     
     # FastAPI
     API_HOST: str = "0.0.0.0"
@@ -46,6 +48,43 @@ class Settings(BaseSettings):
     # Environment
     ENVIRONMENT: str = "development"
 
+    # Maximum number of ids accepted by the POST /{collection}/batch endpoints
+    BATCH_LOOKUP_MAX_IDS: int = 500
+
+    # Seconds the GET /insights/snapshot rollup is served from memory
+    INSIGHTS_CACHE_TTL_SECONDS: float = 30.0
+
+    # In-process response cache for read endpoints opted in with @cached
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+    RESPONSE_CACHE_TTL_SECONDS: float = 60.0
+    # Cache filtered X-Total-Count results in the response cache until the next write
+    COUNT_CACHE_ENABLED: bool = True
+
+    # POST /prompts/bulk and /actions/bulk: items per insert_many and per request
+    BULK_INGEST_CHUNK_SIZE: int = 1000
+    BULK_INGEST_MAX_ITEMS: int = 100_000
+
+    # Most recently recorded (highest _id) ids kept on Engineer.recent_actions / Engineer.prompt_history
+    ENGINEER_RECENT_ACTIONS_LIMIT: int = 50
+    ENGINEER_PROMPT_HISTORY_LIMIT: int = 50
+
+    # Dollar price per million prompt tokens, by prompt model, for GET /usage/tokens
+    TOKEN_PRICE_PER_MILLION: Dict[str, float] = {}
+    DEFAULT_TOKEN_PRICE_PER_MILLION: float = 3.0
+
+    # Write-behind ingestion for POST /prompts/ (202 Accepted, group-committed)
+    PROMPT_WRITE_BEHIND: bool = False
+    PROMPT_BUFFER_MAX_BATCH: int = 500
+    PROMPT_BUFFER_MAX_AGE_SECONDS: float = 0.25
+    PROMPT_BUFFER_MAX_PENDING: int = 10_000
+    PROMPT_BUFFER_PUT_TIMEOUT_SECONDS: float = 1.0
+    PROMPT_BUFFER_STOP_TIMEOUT_SECONDS: float = 30.0
+
+    # GET /stream/events: per-subscriber queue, events kept for Last-Event-ID replay, idle heartbeat
+    EVENT_STREAM_QUEUE_SIZE: int = 256
+    EVENT_STREAM_REPLAY_SIZE: int = 1000
+    EVENT_STREAM_HEARTBEAT_SECONDS: float = 15.0
+
     # Solana / SBT
     SOLANA_RPC_URL: str = "https://api.devnet.solana.com"
     SOLANA_KEYPAIR_PATH: Optional[str] = None
@@ -0,0 +1,63 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import Response
+
+from app.core.cache import cache_key, response_cache
+from app.core.config import settings
+from app.core.versioning import collection_versions
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+IndexKeys = List[Tuple[str, int]]
+
+
+def _pick_hint(query: Dict[str, Any], hints: Sequence[IndexKeys]) -> Optional[IndexKeys]:
+    """First index whose leading key the query constrains"""
+    for keys in hints:
+        if keys[0][0] in query:
+            return keys
+    return None
+
+
+async def count_total(
+    collection,
+    query: Dict[str, Any],
+    hints: Sequence[IndexKeys] = (),
+) -> int:
+    """Number of documents matching `query`, as cheaply as the filter allows.
+
+    No filter: estimated_document_count() (collection metadata, O(1)).
+    Otherwise count_documents() hinted onto the index for the first filtered
+    field in `hints`, cached per filter until the next write to the collection
+    (a count that raced a write is returned but not cached).
+    """
+    if not query:
+        return await collection.estimated_document_count()
+
+    key = cache_key("count", collection.name, query)
+    if settings.COUNT_CACHE_ENABLED:
+        found, total = response_cache.get(key)
+        if found:
+            return total
+
+    version = collection_versions.get(collection.name)
+    hint = _pick_hint(query, hints)
+    if hint is not None:
+        total = await collection.count_documents(query, hint=hint)
+    else:
+        total = await collection.count_documents(query)
+    # Skip the store if a write landed during the count: its invalidation already ran
+    if settings.COUNT_CACHE_ENABLED and collection_versions.get(collection.name) == version:
+        # Tagged like a listing, so record_write() on the collection drops it
+        response_cache.set(key, total, {collection.name})
+    return total
+
+
+async def set_total_count(
+    response: Response,
+    collection,
+    query: Dict[str, Any],
+    hints: Sequence[IndexKeys] = (),
+) -> None:
+    """Set the X-Total-Count header for a listing (before any cursor is applied)"""
+    response.headers[TOTAL_COUNT_HEADER] = str(await count_total(collection, query, hints))
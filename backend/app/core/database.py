@@ -1,6 +1,8 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from contextlib import asynccontextmanager
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorClientSession
+from pymongo.errors import OperationFailure
 from app.core.config import settings
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 class MongoDB:
     client: Optional[AsyncIOMotorClient] = None
@@ -24,9 +26,25 @@ async def connect_to_mongo():
         print(f"   Make sure your .env file has the correct MONGODB_URL")
         raise
 
+# Indexes superseded by a longer compound index with the same prefix; dropped on startup
+REDUNDANT_INDEXES = {
+    "prompts": ["engineer_1_date_-1"],
+    "actions": ["engineer_1_date_-1", "project_1_date_-1"],
+}
+
+async def drop_redundant_indexes(database):
+    """Drop prefix indexes left over from earlier releases so writes stop maintaining them"""
+    for collection_name, index_names in REDUNDANT_INDEXES.items():
+        for index_name in index_names:
+            try:
+                await database[collection_name].drop_index(index_name)
+            except OperationFailure:
+                pass  # Already gone (or never created)
+
 async def create_indexes():
     """Create database indexes for common queries"""
     database = db.client[settings.MONGODB_DB_NAME]
+    await drop_redundant_indexes(database)
     
     # Engineer indexes
     await database.engineers.create_index("github_user")
@@ -36,7 +54,12 @@ async def create_indexes():
     # Prompt indexes
     await database.prompts.create_index("engineer")
     await database.prompts.create_index("date")
-    await database.prompts.create_index([("engineer", 1), ("date", -1)])
+    # Keyset pagination sorts on (date, _id); include _id so each page is a bounded index scan.
+    # (engineer, date, _id) also serves every (engineer, date) query, so no shorter prefix index
+    await database.prompts.create_index([("date", -1), ("_id", -1)])
+    await database.prompts.create_index([("engineer", 1), ("date", -1), ("_id", -1)])
+    # GET /search; a collection can have only one text index
+    await database.prompts.create_index([("text", "text")], name="prompts_text")
     
     # Prospect indexes
     await database.prospects.create_index("github_user")
@@ -45,6 +68,7 @@ async def create_indexes():
     
     # Project indexes
     await database.projects.create_index("engineers")
+    await database.projects.create_index("prospects")
     await database.projects.create_index("start_date")
     await database.projects.create_index("target_date")
     
@@ -52,8 +76,29 @@ async def create_indexes():
     await database.actions.create_index("engineer")
     await database.actions.create_index("project")
     await database.actions.create_index("date")
-    await database.actions.create_index([("engineer", 1), ("date", -1)])
-    await database.actions.create_index([("project", 1), ("date", -1)])
+    await database.actions.create_index([("date", -1), ("_id", -1)])
+    await database.actions.create_index([("engineer", 1), ("date", -1), ("_id", -1)])
+    await database.actions.create_index([("project", 1), ("date", -1), ("_id", -1)])
+    await database.actions.create_index(
+        [("title", "text"), ("description", "text")],
+        weights={"title": 3, "description": 1},
+        name="actions_text",
+    )
+
+    # Daily prompt usage rollups: upserts match all three keys; reports filter by engineer and/or day
+    await database.prompt_usage_daily.create_index(
+        [("engineer", 1), ("day", 1), ("model", 1)], unique=True
+    )
+    await database.prompt_usage_daily.create_index([("day", 1), ("model", 1)])
+
+    # Leaderboards: one upsert key per entry; top-N reads walk (metric, window, score) in order
+    await database.engineer_rankings.create_index(
+        [("metric", 1), ("window", 1), ("engineer", 1)], unique=True
+    )
+    await database.engineer_rankings.create_index(
+        [("metric", 1), ("window", 1), ("score", -1), ("engineer", 1)]
+    )
+    await database.engineer_rankings.create_index("engineer")
 
     # Engineer score indexes
     await database.engineer_scores.create_index(
@@ -72,3 +117,16 @@ async def close_mongo_connection():
 def get_database():
     """Get database instance"""
     return db.client[settings.MONGODB_DB_NAME]
+
+@asynccontextmanager
+async def write_transaction() -> AsyncIterator[Optional[AsyncIOMotorClientSession]]:
+    """Yield a session inside a transaction, or None when MONGODB_TRANSACTIONS is off.
+
+    Pass the yielded value as `session=` to every write that must commit together.
+    """
+    if not settings.MONGODB_TRANSACTIONS:
+        yield None
+        return
+    async with await db.client.start_session() as session:
+        async with session.start_transaction():
+            yield session
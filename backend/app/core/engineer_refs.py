@@ -0,0 +1,90 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.core.config import settings
+
+# Engineer array that mirrors each collection's `engineer` reference
+ENGINEER_REF_FIELDS = {
+    "actions": "recent_actions",
+    "prompts": "prompt_history",
+}
+
+# Engineer counter kept alongside a capped array; the full set lives in the collection
+ENGINEER_COUNT_FIELDS = {
+    "prompts": "prompt_count",
+}
+
+
+def ref_limit(collection_name: str) -> int:
+    """Number of most recently recorded ids kept in the engineer array for a collection"""
+    if collection_name == "prompts":
+        return settings.ENGINEER_PROMPT_HISTORY_LIMIT
+    return settings.ENGINEER_RECENT_ACTIONS_LIMIT
+
+
+def _push_update(collection_name: str, ids: List[ObjectId]) -> Dict[str, Any]:
+    # Arrays hold bare ObjectIds, so they are ordered (and capped) by descending id,
+    # i.e. when the document was recorded, not by its `date`: backfilling old
+    # events pushes out more recently dated ones. Expansions re-sort by date.
+    update: Dict[str, Any] = {
+        "$push": {
+            ENGINEER_REF_FIELDS[collection_name]: {
+                "$each": ids,
+                "$sort": -1,
+                "$slice": ref_limit(collection_name),
+            }
+        }
+    }
+    if collection_name in ENGINEER_COUNT_FIELDS:
+        update["$inc"] = {ENGINEER_COUNT_FIELDS[collection_name]: len(ids)}
+    return update
+
+
+async def push_engineer_refs(
+    db,
+    collection_name: str,
+    documents: Iterable[Dict[str, Any]],
+    session=None,
+) -> List[ObjectId]:
+    """Add new document ids to their engineers' arrays; returns the engineers touched.
+
+    One update per engineer using $push with $each/$sort/$slice (and $inc on
+    the matching counter), so the arrays stay in insertion order and bounded
+    without a re-read.
+    """
+    ids_by_engineer: Dict[ObjectId, List[ObjectId]] = defaultdict(list)
+    for document in documents:
+        if isinstance(document.get("engineer"), ObjectId):
+            ids_by_engineer[document["engineer"]].append(document["_id"])
+    if not ids_by_engineer:
+        return []
+
+    await db.engineers.bulk_write(
+        [
+            UpdateOne({"_id": engineer_id}, _push_update(collection_name, ids))
+            for engineer_id, ids in ids_by_engineer.items()
+        ],
+        ordered=False,
+        session=session,
+    )
+    return list(ids_by_engineer)
+
+
+async def pull_engineer_ref(
+    db,
+    collection_name: str,
+    engineer_id: Optional[ObjectId],
+    document_id: ObjectId,
+    session=None,
+) -> None:
+    """Remove a deleted document's id from its engineer's array"""
+    if not isinstance(engineer_id, ObjectId):
+        return
+    update: Dict[str, Any] = {"$pull": {ENGINEER_REF_FIELDS[collection_name]: document_id}}
+    if collection_name in ENGINEER_COUNT_FIELDS:
+        update["$inc"] = {ENGINEER_COUNT_FIELDS[collection_name]: -1}
+    await db.engineers.update_one({"_id": engineer_id}, update, session=session)
+
@@ -0,0 +1,140 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+# One document per engineer (_id = engineer id), kept current with $inc deltas on writes
+STATS_COLLECTION = "engineer_stats"
+
+# Fields of each collection the stats are derived from
+STATS_FIELDS = {
+    "actions": ("engineer", "event", "date"),
+    "prompts": ("engineer", "tokens", "date"),
+}
+
+
+def event_key(event: Any) -> str:
+    """Map an action event to a safe actions_by_event key.
+
+    Event strings become field names in a dotted $inc path, so "." is
+    replaced and leading "$" stripped; anything left empty is "unknown".
+    """
+    key = str(event).replace(".", "_").lstrip("$") if event is not None else ""
+    return key or "unknown"
+
+
+def event_key_expression(field: str = "$event") -> Dict[str, Any]:
+    """Aggregation expression computing event_key() server-side"""
+    return {
+        "$let": {
+            "vars": {
+                "key": {
+                    "$ltrim": {
+                        "input": {
+                            "$replaceAll": {
+                                "input": {"$toString": {"$ifNull": [field, ""]}},
+                                "find": ".",
+                                "replacement": "_",
+                            }
+                        },
+                        "chars": {"$literal": "$"},
+                    }
+                }
+            },
+            "in": {"$cond": [{"$eq": ["$$key", ""]}, "unknown", "$$key"]},
+        }
+    }
+
+
+def _increments(collection_name: str, document: Dict[str, Any], sign: int) -> Dict[str, int]:
+    if collection_name == "actions":
+        return {"action_count": sign, f"actions_by_event.{event_key(document.get('event'))}": sign}
+    return {"prompt_count": sign, "token_total": sign * (document.get("tokens") or 0)}
+
+
+def _group_by_engineer(documents: Iterable[Dict[str, Any]]) -> Dict[ObjectId, List[Dict[str, Any]]]:
+    grouped: Dict[ObjectId, List[Dict[str, Any]]] = defaultdict(list)
+    for document in documents:
+        if isinstance(document.get("engineer"), ObjectId):
+            grouped[document["engineer"]].append(document)
+    return grouped
+
+
+async def _activity_bound(db, engineer_id: ObjectId, direction: int, session=None) -> Optional[datetime]:
+    """Earliest (direction=1) or latest (-1) action/prompt date, via the (engineer, date, _id) indexes"""
+    dates = []
+    for collection in (db.actions, db.prompts):
+        document = await collection.find_one(
+            {"engineer": engineer_id},
+            {"date": 1},
+            sort=[("date", direction)],
+            session=session,
+        )
+        if document and isinstance(document.get("date"), datetime):
+            dates.append(document["date"])
+    if not dates:
+        return None
+    return min(dates) if direction == 1 else max(dates)
+
+
+async def apply_stats_deltas(
+    db,
+    collection_name: str,
+    documents: Iterable[Dict[str, Any]],
+    sign: int = 1,
+    session=None,
+) -> None:
+    """Add (sign=1) or remove (sign=-1) documents from their engineers' stats.
+
+    Inserts are one upsert per engineer: $inc on the counters plus $min/$max
+    on the activity bounds. Removing the document that set a bound re-reads
+    that bound from the indexed collections instead of rescanning history.
+    """
+    grouped = _group_by_engineer(documents)
+    if not grouped:
+        return
+
+    updates = []
+    for engineer_id, engineer_documents in grouped.items():
+        increments: Dict[str, int] = defaultdict(int)
+        for document in engineer_documents:
+            for field, value in _increments(collection_name, document, sign).items():
+                increments[field] += value
+        update: Dict[str, Any] = {"$inc": dict(increments)}
+        dates = [document["date"] for document in engineer_documents if isinstance(document.get("date"), datetime)]
+        if sign > 0 and dates:
+            update["$min"] = {"first_activity": min(dates)}
+            update["$max"] = {"last_activity": max(dates)}
+        updates.append(UpdateOne({"_id": engineer_id}, update, upsert=sign > 0))
+    await db[STATS_COLLECTION].bulk_write(updates, ordered=False, session=session)
+
+    if sign > 0:
+        return
+    removed_dates = {
+        engineer_id: {document.get("date") for document in engineer_documents}
+        for engineer_id, engineer_documents in grouped.items()
+    }
+    cursor = db[STATS_COLLECTION].find(
+        {"_id": {"$in": list(grouped)}},
+        {"first_activity": 1, "last_activity": 1},
+        session=session,
+    )
+    async for stats in cursor:
+        bounds = {}
+        if stats.get("first_activity") in removed_dates[stats["_id"]]:
+            bounds["first_activity"] = await _activity_bound(db, stats["_id"], 1, session=session)
+        if stats.get("last_activity") in removed_dates[stats["_id"]]:
+            bounds["last_activity"] = await _activity_bound(db, stats["_id"], -1, session=session)
+        if not bounds:
+            continue
+        # Unset rather than store null: null sorts below every date, so a
+        # later $min would keep first_activity at null forever
+        update: Dict[str, Any] = {}
+        found = {field: value for field, value in bounds.items() if value is not None}
+        if found:
+            update["$set"] = found
+        if len(found) < len(bounds):
+            update["$unset"] = {field: "" for field, value in bounds.items() if value is None}
+        await db[STATS_COLLECTION].update_one({"_id": stats["_id"]}, update, session=session)
@@ -0,0 +1,64 @@
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from fastapi import HTTPException, Query
+
+DEFAULT_EXPAND_LIMIT = 50
+MAX_EXPAND_LIMIT = 200
+
+
+def expansion_params(allowed: Set[str]) -> Callable[..., List[str]]:
+    """Dependency factory that parses a comma separated `expand` parameter"""
+
+    def dependency(
+        expand: Optional[str] = Query(
+            default=None,
+            description=f"Comma separated references to resolve: {', '.join(sorted(allowed))}",
+        ),
+    ) -> List[str]:
+        if not expand:
+            return []
+        names = list(dict.fromkeys(part.strip() for part in expand.split(",") if part.strip()))
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot expand: {', '.join(sorted(unknown))}",
+            )
+        return names
+
+    return dependency
+
+
+def lookup_stage(
+    source: str,
+    local_field: str,
+    foreign_field: str,
+    name: str,
+    limit: int,
+    sort: Optional[Dict[str, int]] = None,
+) -> Dict[str, Any]:
+    """Build a $lookup into `expanded.<name>` bounded by a sorted sub-pipeline.
+
+    Uses the concise localField/foreignField + pipeline form (MongoDB 5.0+)
+    so the join is served by the index on `foreign_field`.
+    """
+    pipeline = []
+    if sort:
+        pipeline.append({"$sort": sort})
+    pipeline.append({"$limit": limit})
+    return {
+        "$lookup": {
+            "from": source,
+            "localField": local_field,
+            "foreignField": foreign_field,
+            "pipeline": pipeline,
+            "as": f"expanded.{name}",
+        }
+    }
+
+
+def expanded_projection(projection: Optional[Dict[str, int]]) -> Optional[Dict[str, int]]:
+    """Keep the `expanded` sub-document when the caller asked for specific fields"""
+    if projection and all(projection.values()):
+        return {**projection, "expanded": 1}
+    return projection
@@ -0,0 +1,113 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 1000
+
+# Sort order shared by every keyset-paginated listing (newest first, _id as tiebreaker)
+KEYSET_SORT = [("date", -1), ("_id", -1)]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when an `after` cursor cannot be decoded."""
+
+
+def _encode_payload(payload: Dict[str, Any]) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_payload(cursor: str) -> Dict[str, Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+
+def encode_cursor(document: Dict[str, Any]) -> str:
+    """Build an opaque cursor pointing just past the given document"""
+    return _encode_payload({"d": document["date"].isoformat(), "i": str(document["_id"])})
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decode a cursor produced by `encode_cursor` into its (date, _id) position"""
+    try:
+        payload = _decode_payload(cursor)
+        position_date = datetime.fromisoformat(payload["d"])
+        position_id = ObjectId(payload["i"])
+    except Exception as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+    return position_date, position_id
+
+
+def encode_score_cursor(score: float, document_id: ObjectId) -> str:
+    """Cursor for result lists ordered by (score desc, _id desc), e.g. text search"""
+    return _encode_payload({"s": score, "i": str(document_id)})
+
+
+def decode_score_cursor(cursor: str) -> Tuple[float, ObjectId]:
+    """Decode a cursor produced by `encode_score_cursor` into its (score, _id) position"""
+    try:
+        payload = _decode_payload(cursor)
+        position_score = float(payload["s"])
+        position_id = ObjectId(payload["i"])
+    except Exception as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+    return position_score, position_id
+
+
+def apply_cursor(query: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+    """Restrict a query to documents strictly after the cursor position in KEYSET_SORT order"""
+    if not cursor:
+        return query
+    position_date, position_id = decode_cursor(cursor)
+    keyset = {
+        "$or": [
+            {"date": {"$lt": position_date}},
+            {"date": position_date, "_id": {"$lt": position_id}},
+        ]
+    }
+    if not query:
+        return keyset
+    return {"$and": [query, keyset]}
+
+
+def _keyset_projection(
+    projection: Optional[Dict[str, int]],
+) -> Tuple[Optional[Dict[str, int]], bool]:
+    """Make sure `date` is fetched so the next cursor can be built.
+
+    Returns the projection to send to MongoDB and whether `date` must be
+    stripped from the documents afterwards because the caller did not ask for it.
+    """
+    if not projection:
+        return projection, False
+    if projection.get("date") == 0:
+        trimmed = {key: value for key, value in projection.items() if key != "date"}
+        return trimmed or None, True
+    if all(projection.values()) and "date" not in projection:
+        return {**projection, "date": 1}, True
+    return projection, False
+
+
+async def fetch_page(
+    collection,
+    query: Dict[str, Any],
+    limit: int,
+    projection: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Run a keyset page query and return the documents plus the next cursor (if any)"""
+    projection, hide_date = _keyset_projection(projection)
+    # Fetch one extra row to know whether another page exists without a count
+    cursor = collection.find(query, projection).sort(KEYSET_SORT).limit(limit + 1)
+    documents = await cursor.to_list(length=limit + 1)
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = encode_cursor(documents[-1])
+    if hide_date:
+        for document in documents:
+            document.pop("date", None)
+    return documents, next_cursor
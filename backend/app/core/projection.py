@@ -0,0 +1,135 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Type, Union
+
+from fastapi import HTTPException, Query, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, create_model
+
+Projection = Optional[Dict[str, int]]
+
+
+def _field_names(model: Type[BaseModel]) -> Dict[str, str]:
+    """Map public field names (and aliases) to their MongoDB field names"""
+    names = {}
+    for name, field in model.model_fields.items():
+        stored = field.alias or name
+        names[name] = stored
+        names[stored] = stored
+    return names
+
+
+def _split(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def model_projection(model: Type[BaseModel]) -> Dict[str, int]:
+    """Inclusion projection covering exactly the fields declared on `model`"""
+    return {field.alias or name: 1 for name, field in model.model_fields.items()}
+
+
+def build_projection(
+    model: Type[BaseModel],
+    fields: Optional[str],
+    exclude: Optional[str],
+    model_fields_only: bool = False,
+) -> Projection:
+    """Translate `fields` / `exclude` query values into a MongoDB projection.
+
+    With `model_fields_only` the result is always an inclusion projection
+    limited to the model's fields, so undeclared fields never leave MongoDB.
+    """
+    include_names = _split(fields)
+    exclude_names = _split(exclude)
+    if include_names and exclude_names:
+        raise ValueError("Use either fields or exclude, not both")
+    if not include_names and not exclude_names:
+        return model_projection(model) if model_fields_only else None
+
+    known = _field_names(model)
+    unknown = [name for name in include_names + exclude_names if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+
+    if include_names:
+        projection = {known[name]: 1 for name in include_names}
+        projection["_id"] = 1  # Always keep the id so clients can link back
+        return projection
+
+    excluded = {known[name] for name in exclude_names}
+    if "_id" in excluded:
+        raise ValueError("The id field cannot be excluded")
+    if model_fields_only:
+        return {
+            field: 1 for field in model_projection(model) if field not in excluded
+        }
+    return {field: 0 for field in excluded}
+
+
+def projection_params(
+    model: Type[BaseModel], model_fields_only: bool = False
+) -> Callable[..., Projection]:
+    """Dependency factory that reads `fields` / `exclude` for the given model"""
+
+    def dependency(
+        fields: Optional[str] = Query(
+            default=None,
+            description="Comma separated list of fields to return (id is always included)",
+        ),
+        exclude: Optional[str] = Query(
+            default=None,
+            description="Comma separated list of fields to omit",
+        ),
+    ) -> Projection:
+        try:
+            return build_projection(model, fields, exclude, model_fields_only)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    return dependency
+
+
+@lru_cache(maxsize=None)
+def partial_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """Same shape as `model` with every field optional, used for projected responses"""
+    fields = {
+        name: (Optional[field.annotation], Field(default=None, alias=field.alias))
+        for name, field in model.model_fields.items()
+    }
+    return create_model(
+        f"{model.__name__}Partial",
+        __config__=model.model_config,
+        **fields,
+    )
+
+
+def projected_response(
+    model: Type[BaseModel],
+    documents: Union[Dict[str, Any], List[Dict[str, Any]]],
+    projection: Projection,
+    response: Optional[Response] = None,
+):
+    """Return documents untouched, or as a trimmed JSON response when projected.
+
+    A projected document is missing required fields, so it is validated
+    against the partial variant of `model` and only the fields actually
+    fetched from MongoDB are serialized. Headers already set on the injected
+    `response` (cursors, ETags) are carried over to the returned response.
+    """
+    if projection is None:
+        return documents
+    partial = partial_model(model)
+    if isinstance(documents, list):
+        content = [
+            partial.model_validate(doc).model_dump(
+                mode="json", by_alias=True, exclude_unset=True
+            )
+            for doc in documents
+        ]
+    else:
+        content = partial.model_validate(documents).model_dump(
+            mode="json", by_alias=True, exclude_unset=True
+        )
+    headers = dict(response.headers) if response is not None else None
+    return JSONResponse(content=content, headers=headers)
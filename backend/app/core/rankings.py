@@ -0,0 +1,162 @@
+from datetime import datetime
+from statistics import fmean
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import DeleteOne, UpdateOne
+
+from app.core.engineer_stats import STATS_COLLECTION
+
+# One document per (metric, window, engineer), upserted whenever its inputs change
+RANKINGS_COLLECTION = "engineer_rankings"
+
+# metric -> (windows, direction); direction 1 means higher is better, -1 lower is better.
+# Windows count the most recent monthly performance scores; the other metrics come
+# from lifetime totals, so they only have the "all" window.
+LEADERBOARD_METRICS: Dict[str, Tuple[Tuple[str, ...], int]] = {
+    "performance": (("latest", "3m", "6m", "12m", "all"), 1),
+    "bug_rate": (("all",), -1),
+    "token_cost_per_pr": (("all",), -1),
+    "actions": (("all",), 1),
+    "prompts": (("all",), 1),
+}
+WINDOW_MONTHS = {"latest": 1, "3m": 3, "6m": 6, "12m": 12}
+
+# Metrics read from engineer_stats (metric -> counter); the action and prompt
+# write hooks refresh these, the engineer write handlers refresh the rest
+ACTIVITY_METRICS = {"actions": "action_count", "prompts": "prompt_count"}
+
+# Engineer fields the rankings are derived from (or display)
+RANKING_FIELDS = ("name", "title", "monthly_performance", "pr_count", "bug_count", "token_cost")
+
+
+def metric_value(
+    engineer: Dict[str, Any],
+    metric: str,
+    window: str,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Optional[float]:
+    """The engineer's value for one leaderboard, or None when they are not ranked on it"""
+    if metric in ACTIVITY_METRICS:
+        return (stats or {}).get(ACTIVITY_METRICS[metric]) or None
+    if metric == "performance":
+        scores = engineer.get("monthly_performance") or []
+        if window in WINDOW_MONTHS:
+            scores = scores[-WINDOW_MONTHS[window]:]
+        return fmean(scores) if scores else None
+    pr_count = engineer.get("pr_count") or 0
+    if not pr_count:
+        return None
+    if metric == "bug_rate":
+        return (engineer.get("bug_count") or 0) / pr_count
+    return (engineer.get("token_cost") or 0.0) / pr_count
+
+
+def _ranking_operations(
+    engineer: Dict[str, Any],
+    stats: Optional[Dict[str, Any]],
+    metrics: Iterable[str],
+    now: datetime,
+) -> List[Any]:
+    operations = []
+    for metric in metrics:
+        windows, direction = LEADERBOARD_METRICS[metric]
+        for window in windows:
+            key = {"metric": metric, "window": window, "engineer": engineer["_id"]}
+            value = metric_value(engineer, metric, window, stats)
+            if value is None:
+                operations.append(DeleteOne(key))
+                continue
+            operations.append(UpdateOne(
+                key,
+                {
+                    "$set": {
+                        "value": value,
+                        # Stored so every leaderboard reads best-first in descending order
+                        "score": value * direction,
+                        "name": engineer.get("name"),
+                        "title": engineer.get("title"),
+                        "updated_at": now,
+                    }
+                },
+                upsert=True,
+            ))
+    return operations
+
+
+async def refresh_engineer_rankings(
+    db,
+    engineer: Dict[str, Any],
+    session=None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Upsert one engineer's entry on every leaderboard (unranked entries are removed).
+
+    Only the engineer's own documents are written; ranks are positions in the
+    (metric, window, score) index and are resolved at read time. `stats` is
+    the engineer's engineer_stats document, read by _id when not given.
+    """
+    if stats is None:
+        stats = await db[STATS_COLLECTION].find_one({"_id": engineer["_id"]}, session=session)
+    operations = _ranking_operations(engineer, stats, LEADERBOARD_METRICS, datetime.utcnow())
+    await db[RANKINGS_COLLECTION].bulk_write(operations, ordered=False, session=session)
+
+
+async def refresh_activity_rankings(db, engineer_ids: Iterable[ObjectId], session=None) -> None:
+    """Re-rank engineers on the engineer_stats leaderboards after their activity changed.
+
+    Called from the action and prompt write hooks once the stats deltas are
+    applied: one read of the engineers, one of their stats, one bulk write.
+    """
+    engineer_ids = list(set(engineer_ids))
+    if not engineer_ids:
+        return
+    stats_by_engineer = {
+        stats["_id"]: stats
+        async for stats in db[STATS_COLLECTION].find(
+            {"_id": {"$in": engineer_ids}},
+            {counter: 1 for counter in ACTIVITY_METRICS.values()},
+            session=session,
+        )
+    }
+    now = datetime.utcnow()
+    operations = []
+    async for engineer in db.engineers.find(
+        {"_id": {"$in": engineer_ids}}, {"name": 1, "title": 1}, session=session
+    ):
+        operations += _ranking_operations(
+            engineer, stats_by_engineer.get(engineer["_id"]), ACTIVITY_METRICS, now
+        )
+    if operations:
+        await db[RANKINGS_COLLECTION].bulk_write(operations, ordered=False, session=session)
+
+
+async def remove_engineer_rankings(db, engineer_id: ObjectId, session=None) -> None:
+    await db[RANKINGS_COLLECTION].delete_many({"engineer": engineer_id}, session=session)
+
+
+async def leaderboard_page(db, metric: str, window: str, limit: int) -> Tuple[int, List[Dict[str, Any]]]:
+    """Top `limit` entries with competition rank (ties share a rank) and percentile.
+
+    Reads `limit` keys from the (metric, window, score) index plus one indexed
+    count; the percentile is the share of ranked engineers at or below the entry.
+    """
+    query = {"metric": metric, "window": window}
+    collection = db[RANKINGS_COLLECTION]
+    total = await collection.count_documents(query)
+    documents = await collection.find(query).sort([("score", -1), ("engineer", 1)]).limit(limit).to_list(length=limit)
+    entries = []
+    rank = 0
+    previous_score = None
+    for position, document in enumerate(documents, start=1):
+        if document["score"] != previous_score:
+            rank, previous_score = position, document["score"]
+        entries.append({
+            "rank": rank,
+            "percentile": round(100 * (total - rank + 1) / total, 1),
+            "engineer": document["engineer"],
+            "name": document.get("name"),
+            "title": document.get("title"),
+            "value": document["value"],
+        })
+    return total, entries
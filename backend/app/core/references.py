@@ -0,0 +1,35 @@
+from typing import Any, Optional
+
+from bson import ObjectId
+
+
+def reference_id(value: Any, label: str, required: bool = True) -> Optional[ObjectId]:
+    """Coerce a stored reference to an ObjectId; raises ValueError on any other shape.
+
+    Optional references are stored as null, never as "" or a hex string, so
+    reference filters and indexes only ever see ObjectIds.
+    """
+    if isinstance(value, ObjectId):
+        return value
+    if isinstance(value, str) and ObjectId.is_valid(value):
+        return ObjectId(value)
+    if not required and value in (None, ""):
+        return None
+    raise ValueError(f"Invalid {label} ID")
+
+
+# Reference fields per collection: field -> required
+REFERENCE_FIELDS = {
+    "actions": {"engineer": True, "project": False},
+    "prompts": {"engineer": True},
+}
+
+
+def reference_validator(collection_name: str) -> dict:
+    """$jsonSchema validator that rejects any other reference shape at the database"""
+    properties = {
+        field: {"bsonType": "objectId" if required else ["objectId", "null"]}
+        for field, required in REFERENCE_FIELDS[collection_name].items()
+    }
+    required = [field for field, is_required in REFERENCE_FIELDS[collection_name].items() if is_required]
+    return {"$jsonSchema": {"bsonType": "object", "required": required, "properties": properties}}
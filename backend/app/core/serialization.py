@@ -0,0 +1,90 @@
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Type, get_args
+
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+
+def _default(value: Any):
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode BSON-native values (ObjectId, datetime) straight to JSON bytes"""
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson, for payloads already shaped like the response model"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _is_date_field(annotation: Any) -> bool:
+    # datetime subclasses date, so compare exactly
+    return annotation is date or date in get_args(annotation)
+
+
+@lru_cache(maxsize=None)
+def _model_shape(model: Type[BaseModel]) -> Tuple[Dict[str, Any], FrozenSet[str]]:
+    """Static defaults and date-typed fields for `model`, keyed by stored name"""
+    defaults = {}
+    date_fields = set()
+    for name, field in model.model_fields.items():
+        stored = field.alias or name
+        default = field.get_default(call_default_factory=False)
+        if default is not PydanticUndefined and field.default_factory is None:
+            defaults[stored] = default
+        if _is_date_field(field.annotation):
+            date_fields.add(stored)
+    return defaults, frozenset(date_fields)
+
+
+def shape_documents(
+    model: Type[BaseModel],
+    documents: List[Dict[str, Any]],
+    projection: Optional[Dict[str, int]] = None,
+) -> List[Dict[str, Any]]:
+    """Make raw Motor documents serialize like `model` would, without validating them.
+
+    Fills declared defaults for missing fields and renders `date` fields
+    (stored as BSON datetimes) as plain dates. Undeclared fields are
+    expected to be dropped already by an inclusion projection.
+    """
+    defaults, date_fields = _model_shape(model)
+    if projection:
+        defaults = {key: value for key, value in defaults.items() if key in projection}
+        date_fields = date_fields.intersection(projection)
+    for document in documents:
+        for key, value in defaults.items():
+            if key not in document:
+                document[key] = value
+        for key in date_fields:
+            value = document.get(key)
+            if isinstance(value, datetime):
+                document[key] = value.date()
+    return documents
+
+
+def fast_response(
+    model: Type[BaseModel],
+    documents: List[Dict[str, Any]],
+    projection: Optional[Dict[str, int]] = None,
+    response: Optional[Response] = None,
+) -> FastJSONResponse:
+    """Render a list endpoint's documents directly, skipping response_model validation.
+
+    The route keeps its `response_model` for the OpenAPI schema; returning a
+    Response bypasses FastAPI's per-item validation and re-serialization.
+    """
+    headers = dict(response.headers) if response is not None else None
+    return FastJSONResponse(shape_documents(model, documents, projection), headers=headers)
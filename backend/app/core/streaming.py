@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+
+from app.core.serialization import dumps
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Documents fetched per getMore; bounds server memory regardless of collection size
+EXPORT_BATCH_SIZE = 500
+
+# Lines are coalesced into chunks of roughly this size before being written
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def date_range_filter(
+    start: Optional[datetime], end: Optional[datetime]
+) -> Optional[Dict[str, datetime]]:
+    """Build a half-open [start, end) range condition, or None when unbounded"""
+    condition = {}
+    if start:
+        condition["$gte"] = start
+    if end:
+        condition["$lt"] = end
+    return condition or None
+
+
+async def _iter_ndjson(cursor) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for document in cursor:
+        buffer += dumps(document)
+        buffer += b"\n"
+        if len(buffer) >= EXPORT_CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def ndjson_response(cursor, filename: str) -> StreamingResponse:
+    """Stream a Motor cursor as newline-delimited JSON, one document per line"""
+    return StreamingResponse(
+        _iter_ndjson(cursor.batch_size(EXPORT_BATCH_SIZE)),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,62 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.core.buckets import truncate
+from app.core.config import settings
+
+# Daily token rollups per (engineer, model, day), kept in step with prompts on every write
+USAGE_COLLECTION = "prompt_usage_daily"
+
+# Prompt fields the rollups are derived from
+USAGE_FIELDS = ("engineer", "model", "date", "tokens")
+
+
+def token_cost(model: Optional[str], tokens: float) -> float:
+    """Dollar cost of `tokens` at the configured per-million price for `model`"""
+    price = settings.TOKEN_PRICE_PER_MILLION.get(model or "", settings.DEFAULT_TOKEN_PRICE_PER_MILLION)
+    return tokens * price / 1_000_000
+
+
+def _usage_key(prompt: Dict[str, Any]) -> Optional[Tuple[ObjectId, str, datetime]]:
+    if not isinstance(prompt.get("engineer"), ObjectId) or not isinstance(prompt.get("date"), datetime):
+        return None
+    return prompt["engineer"], prompt.get("model") or "", truncate(prompt["date"], "day")
+
+
+async def apply_usage_deltas(
+    db,
+    prompts: Iterable[Dict[str, Any]],
+    sign: int = 1,
+    session=None,
+) -> None:
+    """Add (sign=1) or remove (sign=-1) prompts from their daily rollups with upserted $inc.
+
+    Prompts are folded per (engineer, model, day) first, so a bulk chunk
+    costs one update per rollup row rather than one per prompt.
+    """
+    deltas: Dict[Tuple[ObjectId, str, datetime], list] = defaultdict(lambda: [0, 0])
+    for prompt in prompts:
+        key = _usage_key(prompt)
+        if key is not None:
+            deltas[key][0] += sign
+            deltas[key][1] += sign * (prompt.get("tokens") or 0)
+    if not deltas:
+        return
+
+    await db[USAGE_COLLECTION].bulk_write(
+        [
+            UpdateOne(
+                {"engineer": engineer, "model": model, "day": day},
+                {"$inc": {"prompts": prompt_count, "tokens": tokens}},
+                # Removals only touch existing rows, never create negative ones
+                upsert=sign > 0,
+            )
+            for (engineer, model, day), (prompt_count, tokens) in deltas.items()
+        ],
+        ordered=False,
+        session=session,
+    )
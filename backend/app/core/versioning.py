@@ -0,0 +1,70 @@
+import secrets
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+
+
+class CollectionVersions:
+    """In-process version stamps per collection, bumped by the write handlers.
+
+    The counters live only in this process's memory. Each ETag is prefixed
+    with a random per-process nonce, so ETags from before a restart (or from
+    another worker process) never validate here. Writes this process does not
+    see do not bump the counters: the scripts/ jobs, direct Mongo access and
+    writes handled by other API workers. A client holding an ETag from this
+    process can then get a 304 for data that has changed. Restart the API
+    after such writes, and run one worker per deployment if ETags must stay
+    exact.
+    """
+
+    def __init__(self) -> None:
+        # Per-process nonce: counters restart at 0, so stamps alone would repeat
+        self._boot_id = secrets.token_hex(8)
+        self._versions: Dict[str, int] = defaultdict(int)
+
+    def bump(self, *collections: str) -> None:
+        for collection in collections:
+            self._versions[collection] += 1
+
+    def get(self, collection: str) -> int:
+        return self._versions[collection]
+
+    def snapshot(self, collections: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self._versions[collection] for collection in collections)
+
+    def etag(self, collections: Tuple[str, ...]) -> str:
+        stamp = ".".join(str(self._versions[collection]) for collection in collections)
+        return f'"{self._boot_id}-{stamp}"'
+
+
+collection_versions = CollectionVersions()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == etag
+        for candidate in candidates
+    )
+
+
+def conditional_get(*collections: str) -> Callable[..., str]:
+    """Dependency factory for GET routes whose payload depends on `collections`.
+
+    Emits a strong ETag built from the collection versions and answers
+    304 Not Modified before the handler runs when the client's copy is current.
+    """
+    tracked = tuple(sorted(set(collections)))
+
+    def dependency(request: Request, response: Response) -> str:
+        etag = collection_versions.etag(tracked)
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return etag
+
+    return dependency
@@ -0,0 +1,80 @@
+from typing import Any, Dict, List
+
+from bson import ObjectId
+
+from app.core.cache import record_write
+from app.core.database import get_database
+from app.core.engineer_refs import pull_engineer_ref, push_engineer_refs
+from app.core.engineer_stats import STATS_FIELDS, apply_stats_deltas
+from app.core.rankings import refresh_activity_rankings
+from app.core.usage import USAGE_FIELDS, apply_usage_deltas
+
+# Fields each collection's delete hooks read from the deleted document
+DELETE_HOOK_PROJECTIONS = {
+    "actions": {field: 1 for field in STATS_FIELDS["actions"]},
+    "prompts": {field: 1 for field in (*USAGE_FIELDS, *STATS_FIELDS["prompts"])},
+}
+
+
+def _engineers(*documents: Dict[str, Any]) -> List[ObjectId]:
+    return [document["engineer"] for document in documents if isinstance(document.get("engineer"), ObjectId)]
+
+
+async def apply_insert_hooks(
+    db,
+    collection_name: str,
+    documents: List[Dict[str, Any]],
+    session=None,
+) -> List[ObjectId]:
+    """Update data derived from newly inserted documents; returns the engineers modified"""
+    engineer_ids = await push_engineer_refs(db, collection_name, documents, session=session)
+    await apply_stats_deltas(db, collection_name, documents, session=session)
+    await refresh_activity_rankings(db, _engineers(*documents), session=session)
+    if collection_name == "prompts":
+        await apply_usage_deltas(db, documents, session=session)
+    return engineer_ids
+
+
+async def apply_delete_hooks(
+    db,
+    collection_name: str,
+    document: Dict[str, Any],
+    session=None,
+) -> List[ObjectId]:
+    """Undo a deleted document's derived data; `document` needs DELETE_HOOK_PROJECTIONS fields"""
+    await pull_engineer_ref(db, collection_name, document.get("engineer"), document["_id"], session=session)
+    await apply_stats_deltas(db, collection_name, [document], sign=-1, session=session)
+    await refresh_activity_rankings(db, _engineers(document), session=session)
+    if collection_name == "prompts":
+        await apply_usage_deltas(db, [document], sign=-1, session=session)
+    return _engineers(document)
+
+
+async def apply_update_hooks(
+    db,
+    collection_name: str,
+    before: Dict[str, Any],
+    after: Dict[str, Any],
+    session=None,
+) -> List[ObjectId]:
+    """Move derived data from the old to the new version of an updated document"""
+    engineer_ids = []
+    if before.get("engineer") != after.get("engineer"):
+        await pull_engineer_ref(db, collection_name, before.get("engineer"), before["_id"], session=session)
+        engineer_ids += [before["engineer"]] if isinstance(before.get("engineer"), ObjectId) else []
+        engineer_ids += await push_engineer_refs(db, collection_name, [after], session=session)
+    if any(before.get(field) != after.get(field) for field in STATS_FIELDS[collection_name]):
+        await apply_stats_deltas(db, collection_name, [before], sign=-1, session=session)
+        await apply_stats_deltas(db, collection_name, [after], session=session)
+        await refresh_activity_rankings(db, _engineers(before, after), session=session)
+    if collection_name == "prompts" and any(before.get(field) != after.get(field) for field in USAGE_FIELDS):
+        await apply_usage_deltas(db, [before], sign=-1, session=session)
+        await apply_usage_deltas(db, [after], session=session)
+    return engineer_ids
+
+
+async def inserted_hook(collection_name: str, documents: List[Dict[str, Any]]) -> None:
+    """Post-insert hook for the bulk and write-behind paths"""
+    engineer_ids = await apply_insert_hooks(get_database(), collection_name, documents)
+    for engineer_id in engineer_ids:
+        record_write("engineers", engineer_id)
@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.cache import response_cache
 from app.core.config import settings
 from app.core.database import connect_to_mongo, close_mongo_connection
+from app.services import event_hub, prompt_write_buffer
 from app.api.v1 import api_router
 
 app = FastAPI(
@@ -17,15 +19,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag"],
 )
 
 # Database connection lifecycle
 @app.on_event("startup")
 async def startup_event():
     await connect_to_mongo()
+    if settings.PROMPT_WRITE_BEHIND:
+        await prompt_write_buffer.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    # Flush buffered prompts while the database connection is still open
+    await prompt_write_buffer.stop()
+    await event_hub.stop()
     await close_mongo_connection()
 
 # Include API routes
@@ -38,3 +46,11 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "response_cache": response_cache.stats(),
+        "prompt_write_buffer": prompt_write_buffer.stats(),
+        "event_stream": event_hub.stats(),
+    }
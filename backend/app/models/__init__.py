@@ -1,15 +1,39 @@
 from app.models.engineer import Engineer
 from app.models.engineer_score import EngineerScore
+from app.models.engineer_stats import EngineerStats
 from app.models.prompt import Prompt
 from app.models.prospect import Prospect
 from app.models.project import Project
 from app.models.action import Action
+from app.models.activity import ActionFacets, ActionHistogram
+from app.models.batch import BatchRequest, BatchResult
+from app.models.bulk import BulkItemResult, BulkResult
+from app.models.dashboard import ProjectDashboard
+from app.models.expanded import ExpandedEngineer, ExpandedProject
+from app.models.insights import InsightsSnapshot
+from app.models.leaderboard import Leaderboard
+from app.models.search import SearchHit
+from app.models.usage import TokenUsage
 
 __all__ = [
     "Engineer",
     "EngineerScore",
+    "EngineerStats",
     "Prompt",
     "Prospect",
     "Project",
     "Action",
+    "ActionFacets",
+    "ActionHistogram",
+    "BatchRequest",
+    "BatchResult",
+    "BulkItemResult",
+    "BulkResult",
+    "ProjectDashboard",
+    "ExpandedEngineer",
+    "ExpandedProject",
+    "InsightsSnapshot",
+    "Leaderboard",
+    "SearchHit",
+    "TokenUsage",
 ]
@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.models.engineer import PyObjectId
+
+
+class HistogramBucket(BaseModel):
+    start: datetime  # Bucket start (UTC); weeks start on Monday
+    total: int = 0
+    counts: Dict[str, int] = {}  # event -> count, zero-filled for every event in the histogram
+
+
+class ActionHistogram(BaseModel):
+    """Dense per-bucket action counts by event; buckets with no actions are zero-filled"""
+    bucket: str  # "day", "week" or "month"
+    start: datetime
+    end: datetime
+    events: List[str] = []
+    series: List[HistogramBucket] = []
+
+
+class EventFacet(BaseModel):
+    event: str
+    count: int = 0
+
+
+class EngineerFacet(BaseModel):
+    id: PyObjectId
+    name: Optional[str] = None
+    count: int = 0
+
+
+class ProjectFacet(BaseModel):
+    id: Optional[PyObjectId] = None  # None counts actions without a project
+    title: Optional[str] = None
+    count: int = 0
+
+
+class ActionFacets(BaseModel):
+    """Action counts per event, engineer and project for one filter set, most frequent first"""
+    total: int = 0
+    events: List[EventFacet] = []
+    engineers: List[EngineerFacet] = []
+    projects: List[ProjectFacet] = []
@@ -0,0 +1,16 @@
+from typing import Generic, List, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class BatchRequest(BaseModel):
+    """Request body for resolving many documents by id in one call"""
+    ids: List[str] = Field(..., description="ObjectId strings to resolve, in the desired order")
+
+
+class BatchResult(BaseModel, Generic[T]):
+    """Documents found for a batch request, plus the ids that did not resolve"""
+    items: List[T] = []  # Found documents, in the order requested
+    missing: List[str] = []  # Requested ids with no matching document
@@ -0,0 +1,26 @@
+from typing import List, Optional
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+from app.models.engineer import PyObjectId
+
+
+class BulkItemResult(BaseModel):
+    """Outcome for one item of a bulk request, by its 0-based position in the body"""
+    index: int
+    id: Optional[PyObjectId] = None  # Set when the item was inserted
+    error: Optional[str] = None  # Set when the item was rejected
+
+    model_config = {
+        "arbitrary_types_allowed": True,
+        "json_encoders": {ObjectId: str},
+    }
+
+
+class BulkResult(BaseModel):
+    """Summary of a bulk ingest request"""
+    received: int = 0
+    inserted: int = 0
+    failed: int = 0
+    results: List[BulkItemResult] = []
@@ -0,0 +1,55 @@
+from datetime import date
+from typing import List, Optional
+
+from bson import ObjectId
+from pydantic import BaseModel, Field
+
+from app.models.action import Action
+from app.models.activity import ActionHistogram
+from app.models.engineer import PyObjectId
+from app.models.project import Project
+
+
+class TeamMemberSummary(BaseModel):
+    """The engineer fields the project page shows for a team member"""
+    id: PyObjectId = Field(alias="_id")
+    name: str
+    title: str
+    github_user: Optional[str] = None
+    pr_count: int = 0
+    bug_count: int = 0
+    token_cost: float = 0.0
+    performance: Optional[float] = None  # Latest monthly performance score
+
+    model_config = {
+        "populate_by_name": True,
+        "arbitrary_types_allowed": True,
+        "json_encoders": {ObjectId: str},
+    }
+
+
+class ProspectSummary(BaseModel):
+    """The prospect fields the prospective hires panel shows"""
+    id: PyObjectId = Field(alias="_id")
+    name: str
+    title: str
+    github_user: Optional[str] = None
+    date_applied: Optional[date] = None
+    pr_count: int = 0
+    bug_count: int = 0
+    performance: float = 0.0
+
+    model_config = {
+        "populate_by_name": True,
+        "arbitrary_types_allowed": True,
+        "json_encoders": {ObjectId: str, date: str},
+    }
+
+
+class ProjectDashboard(BaseModel):
+    """Everything the project page renders, from one aggregation"""
+    project: Project
+    team: List[TeamMemberSummary] = []
+    prospects: List[ProspectSummary] = []  # Best performance first
+    recent_actions: List[Action] = []  # Newest first
+    activity: ActionHistogram  # Weekly action counts by event, zero-filled
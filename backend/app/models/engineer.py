@@ -46,9 +46,10 @@ class Engineer(BaseModel):
     bug_count: int = 0
     avg_review_time: Optional[float] = None  # in hours
     token_cost: float = 0.0
-    prompt_history: List[PyObjectId] = []  # Array of ObjectIds referencing Prompt
+    prompt_history: List[PyObjectId] = []  # Most recently recorded prompt ids (by _id, not date), capped; full history via GET /prompts/?engineer_id=
+    prompt_count: int = 0  # Total prompts by this engineer
     monthly_performance: List[float] = []  # Array of performance scores (1.0-10.0)
-    recent_actions: List[PyObjectId] = []  # Array of ObjectIds referencing Action
+    recent_actions: List[PyObjectId] = []  # Most recently recorded action ids (by _id, not date), capped
 
     model_config = {
         "populate_by_name": True,
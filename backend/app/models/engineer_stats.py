@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from bson import ObjectId
+from pydantic import BaseModel, Field, field_validator
+
+from app.models.engineer import PyObjectId
+
+
+class EngineerStats(BaseModel):
+    """Activity counters for one engineer, maintained incrementally from actions and prompts."""
+
+    engineer: PyObjectId = Field(alias="_id")
+    action_count: int = 0
+    actions_by_event: Dict[str, int] = {}  # event -> number of actions
+    prompt_count: int = 0
+    token_total: int = 0
+    first_activity: Optional[datetime] = None  # Earliest action or prompt date
+    last_activity: Optional[datetime] = None  # Latest action or prompt date
+
+    model_config = {
+        "populate_by_name": True,
+        "arbitrary_types_allowed": True,
+        "json_encoders": {ObjectId: str},
+    }
+
+    @field_validator("actions_by_event")
+    @classmethod
+    def drop_empty_events(cls, value: Dict[str, int]) -> Dict[str, int]:
+        # Deletes decrement counters to zero rather than removing them
+        return {event: count for event, count in value.items() if count}
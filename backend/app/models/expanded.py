@@ -0,0 +1,33 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.models.action import Action
+from app.models.engineer import Engineer
+from app.models.project import Project
+from app.models.prompt import Prompt
+from app.models.prospect import Prospect
+
+
+class EngineerExpansions(BaseModel):
+    """Referenced documents resolved by GET /engineers/{id}?expand=..."""
+    recent_actions: Optional[List[Action]] = None
+    prompt_history: Optional[List[Prompt]] = None
+    projects: Optional[List[Project]] = None
+
+
+class ExpandedEngineer(Engineer):
+    """Engineer with its references optionally resolved in place"""
+    expanded: Optional[EngineerExpansions] = None
+
+
+class ProjectExpansions(BaseModel):
+    """Referenced documents resolved by GET /projects/{id}?expand=..."""
+    engineers: Optional[List[Engineer]] = None
+    prospects: Optional[List[Prospect]] = None
+    actions: Optional[List[Action]] = None
+
+
+class ExpandedProject(Project):
+    """Project with its references optionally resolved in place"""
+    expanded: Optional[ProjectExpansions] = None
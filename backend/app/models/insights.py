@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+from app.models.engineer import PyObjectId
+
+
+class OrgSnapshot(BaseModel):
+    """Headline averages across all engineers"""
+    total_engineers: int = 0
+    avg_prs: float = 0.0
+    avg_bugs: float = 0.0
+    avg_token_cost: float = 0.0
+
+
+class TopEngineer(BaseModel):
+    id: PyObjectId
+    name: str
+    title: str
+    pr_count: int = 0
+    bug_count: int = 0
+    performance: float = 0.0  # Latest monthly performance score
+
+
+class EngineerTokenUsage(BaseModel):
+    engineer: PyObjectId
+    name: Optional[str] = None
+    prompt_count: int = 0
+    total_tokens: int = 0
+
+
+class AIUsage(BaseModel):
+    total_prompts: int = 0
+    total_tokens: int = 0
+    avg_tokens_per_prompt: float = 0.0
+
+
+class ProjectStaffing(BaseModel):
+    id: PyObjectId
+    title: str
+    importance: Optional[str] = None
+    engineer_count: int = 0
+    prospect_count: int = 0
+
+
+class ProspectRanking(BaseModel):
+    id: PyObjectId
+    name: str
+    title: str
+    performance: float = 0.0
+    pr_count: int = 0
+
+
+class InsightsSnapshot(BaseModel):
+    """Compact rollup used by the Stirixi AI assistant instead of full collection dumps"""
+    snapshot: OrgSnapshot
+    top_engineers: List[TopEngineer] = []
+    engineer_tokens: List[EngineerTokenUsage] = []
+    ai_usage: AIUsage
+    action_counts: Dict[str, int] = {}  # event -> count across all actions
+    recent_action_counts: Dict[str, int] = {}  # event -> count across the latest actions
+    project_health: List[ProjectStaffing] = []
+    pipeline: List[ProspectRanking] = []
+    generated_at: datetime
+
+    model_config = {
+        "arbitrary_types_allowed": True,
+        "json_encoders": {ObjectId: str},
+    }
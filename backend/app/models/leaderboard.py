@@ -0,0 +1,22 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.models.engineer import PyObjectId
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int  # Competition rank: tied values share a rank
+    percentile: float  # Share of ranked engineers at or below this rank (top = 100)
+    engineer: PyObjectId
+    name: Optional[str] = None
+    title: Optional[str] = None
+    value: float
+
+
+class Leaderboard(BaseModel):
+    """Best-first engineers for one metric and window, from precomputed rankings"""
+    metric: str
+    window: str
+    total: int = 0  # Engineers ranked on this leaderboard
+    entries: List[LeaderboardEntry] = []
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from bson import ObjectId
+from pydantic import BaseModel, Field
+
+from app.models.engineer import PyObjectId
+
+
+class SearchHit(BaseModel):
+    """One prompt or action matching a full-text search, with its relevance score"""
+    type: Literal["prompt", "action"]
+    id: PyObjectId = Field(alias="_id")
+    score: float
+    date: datetime
+    engineer: Optional[PyObjectId] = None
+    project: Optional[PyObjectId] = None  # Actions only
+    text: Optional[str] = None  # Prompt text
+    model: Optional[str] = None  # Prompt model
+    title: Optional[str] = None  # Action title
+    description: Optional[str] = None  # Action description
+    event: Optional[str] = None  # Action event
+
+    model_config = {
+        "populate_by_name": True,
+        "arbitrary_types_allowed": True,
+        "json_encoders": {ObjectId: str},
+        "protected_namespaces": (),
+    }
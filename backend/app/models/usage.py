@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import List, Optional
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+from app.models.engineer import PyObjectId
+
+
+class TokenUsageRow(BaseModel):
+    """Prompt volume and spend for one bucket (and engineer/model when grouped by them)"""
+    start: datetime  # Bucket start (UTC)
+    engineer: Optional[PyObjectId] = None
+    model: Optional[str] = None
+    prompts: int = 0
+    tokens: int = 0
+    cost: float = 0.0  # Dollars at the configured per-model token price
+
+    model_config = {
+        "arbitrary_types_allowed": True,
+        "json_encoders": {ObjectId: str},
+        "protected_namespaces": (),
+    }
+
+
+class TokenUsageTotals(BaseModel):
+    prompts: int = 0
+    tokens: int = 0
+    cost: float = 0.0
+
+
+class TokenUsage(BaseModel):
+    """Token usage series read from the daily prompt rollups"""
+    bucket: str  # "day", "week" or "month"
+    start: datetime
+    end: datetime
+    group_by: List[str] = []
+    totals: TokenUsageTotals = TokenUsageTotals()
+    series: List[TokenUsageRow] = []
@@ -4,10 +4,26 @@ from app.services.solana_service import (
     SolanaTransactionResult,
     solana_sbt_service,
 )
+from app.services.event_stream import (
+    EventHub,
+    EventStreamUnavailableError,
+    event_hub,
+)
+from app.services.write_behind import (
+    WriteBehindBuffer,
+    WriteBufferFullError,
+    prompt_write_buffer,
+)
 
 __all__ = [
     "SolanaSBTError",
     "SolanaSBTService",
     "SolanaTransactionResult",
     "solana_sbt_service",
+    "EventHub",
+    "EventStreamUnavailableError",
+    "event_hub",
+    "WriteBehindBuffer",
+    "WriteBufferFullError",
+    "prompt_write_buffer",
 ]
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+from bson import ObjectId
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Sentinels queued to a subscriber instead of a change
+OVERFLOW = b"event: overflow\ndata: {}\n\n"
+RESET = b"event: reset\ndata: {}\n\n"
+
+# Server error codes for a resume token that is no longer in the oplog
+# (ChangeStreamFatalError on older servers, ChangeStreamHistoryLost since 4.4)
+HISTORY_LOST_CODES = {280, 286}
+
+
+class EventStreamUnavailableError(RuntimeError):
+    """Raised when the shared change stream cannot be opened (e.g. standalone mongod)."""
+
+
+@dataclass(eq=False)
+class Subscription:
+    """One SSE client: a bounded queue of encoded events plus its filters."""
+
+    queue: asyncio.Queue
+    engineer: Optional[ObjectId] = None
+    project: Optional[ObjectId] = None
+    closed: bool = False
+
+    def matches(self, engineer: Optional[ObjectId], project: Optional[ObjectId]) -> bool:
+        if self.engineer is not None and engineer != self.engineer:
+            return False
+        if self.project is not None and project != self.project:
+            return False
+        return True
+
+    def offer(self, message: bytes) -> bool:
+        """Queue without waiting; on overflow replace the backlog with an overflow notice"""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+            self.closed = True
+            return False
+
+
+@dataclass
+class _Event:
+    token: str
+    message: bytes
+    engineer: Optional[ObjectId]
+    project: Optional[ObjectId]
+
+
+def _reference(document: Dict[str, Any], *names: str) -> Optional[ObjectId]:
+    for name in names:
+        value = document.get(name)
+        if isinstance(value, ObjectId):
+            return value
+    return None
+
+
+class EventHub:
+    """Fans one database change stream out to many SSE subscribers.
+
+    The stream is opened by the first subscriber and resumes from its last
+    token after transient errors. Recent events are kept in a replay buffer
+    so clients reconnecting with Last-Event-ID miss nothing; a slow client
+    whose queue fills gets an `overflow` event and is disconnected. If the
+    token has fallen out of the oplog the stream restarts from now and every
+    connected subscriber gets a `reset` event, since changes were missed.
+    """
+
+    def __init__(self, collections: Tuple[str, ...], queue_size: int, replay_size: int) -> None:
+        self.collections = collections
+        self.queue_size = queue_size
+        self._subscriptions: Set[Subscription] = set()
+        self._replay: Deque[_Event] = deque(maxlen=replay_size)
+        self._resume_token: Optional[Dict[str, Any]] = None
+        self._stream = None
+        self._worker: Optional[asyncio.Task] = None
+        self._start_lock = asyncio.Lock()
+        self.events = 0
+        self.overflows = 0
+        self.restarts = 0
+        self.resets = 0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def _pipeline(self):
+        return [
+            {
+                "$match": {
+                    "ns.coll": {"$in": list(self.collections)},
+                    "operationType": {"$in": ["insert", "update", "replace", "delete"]},
+                }
+            }
+        ]
+
+    async def _open(self):
+        """Open the database-level change stream and wait until the server accepts it"""
+        stream = get_database().watch(
+            self._pipeline(),
+            full_document="updateLookup",
+            resume_after=self._resume_token,
+        )
+        # The aggregate runs on first use; try_next surfaces "replica set required" here
+        first = await stream.try_next()
+        if first is not None:
+            self._dispatch(first)
+        return stream
+
+    async def _reopen(self):
+        """Open from the last token, or from now if the oplog no longer has it"""
+        try:
+            return await self._open()
+        except OperationFailure as exc:
+            if self._resume_token is None or exc.code not in HISTORY_LOST_CODES:
+                raise
+        logger.warning("Change stream resume token is no longer in the oplog; restarting from now")
+        self._resume_token = None
+        # Replaying across the gap would hide it, so old ids now get a reset too
+        self._replay.clear()
+        self.resets += 1
+        for subscription in list(self._subscriptions):
+            if not subscription.offer(RESET):
+                self.overflows += 1
+                self._subscriptions.discard(subscription)
+        return await self._open()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        async with self._start_lock:
+            if self.running:
+                return
+            try:
+                self._stream = await self._reopen()
+            except PyMongoError as exc:
+                raise EventStreamUnavailableError(
+                    "Change streams require a replica set or Atlas cluster"
+                ) from exc
+            self._worker = asyncio.create_task(self._run())
+            logger.info("Change stream on %s opened", ", ".join(self.collections))
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._stream is not None:
+            await self._stream.close()
+            self._stream = None
+        for subscription in self._subscriptions:
+            subscription.closed = True
+            subscription.offer(RESET)
+        self._subscriptions.clear()
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                async for change in self._stream:
+                    self._dispatch(change)
+                    delay = 1.0
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError:
+                logger.exception("Change stream failed; reopening after %.0fs", delay)
+            # Reopen from the last token (the driver already retried once on resumable errors)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+            try:
+                if self._stream is not None:
+                    await self._stream.close()
+                self._stream = await self._reopen()
+                self.restarts += 1
+            except PyMongoError:
+                logger.exception("Could not reopen change stream")
+
+    def _dispatch(self, change: Dict[str, Any]) -> None:
+        self._resume_token = change["_id"]
+        document = change.get("fullDocument") or {}
+        token = change["_id"]["_data"]
+        payload = {
+            "collection": change["ns"]["coll"],
+            "operation": change["operationType"],
+            "id": change.get("documentKey", {}).get("_id"),
+            "document": change.get("fullDocument"),
+        }
+        event = _Event(
+            token=token,
+            message=b"id: " + token.encode() + b"\nevent: change\ndata: " + dumps(payload) + b"\n\n",
+            engineer=_reference(document, "engineer", "engineer_id"),
+            project=_reference(document, "project", "project_id"),
+        )
+        self._replay.append(event)
+        self.events += 1
+        for subscription in list(self._subscriptions):
+            if subscription.matches(event.engineer, event.project) and not subscription.offer(event.message):
+                self.overflows += 1
+                self._subscriptions.discard(subscription)
+
+    async def subscribe(
+        self,
+        engineer: Optional[ObjectId] = None,
+        project: Optional[ObjectId] = None,
+        last_event_id: Optional[str] = None,
+    ) -> Subscription:
+        """Register a subscriber, replaying anything it missed since `last_event_id`"""
+        await self.start()
+        subscription = Subscription(asyncio.Queue(maxsize=self.queue_size), engineer, project)
+        if last_event_id:
+            tokens = [event.token for event in self._replay]
+            if last_event_id in tokens:
+                for event in list(self._replay)[tokens.index(last_event_id) + 1:]:
+                    if subscription.matches(event.engineer, event.project) and not subscription.offer(event.message):
+                        self.overflows += 1
+                        return subscription
+            else:
+                # Too old for the replay buffer: the client must refetch state
+                subscription.offer(RESET)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "subscribers": len(self._subscriptions),
+            "events": self.events,
+            "overflows": self.overflows,
+            "restarts": self.restarts,
+            "resets": self.resets,
+            "replay_buffered": len(self._replay),
+        }
+
+
+event_hub = EventHub(
+    collections=("actions", "prompts", "engineer_scores"),
+    queue_size=settings.EVENT_STREAM_QUEUE_SIZE,
+    replay_size=settings.EVENT_STREAM_REPLAY_SIZE,
+)
@@ -23,6 +23,7 @@ logger = logging.getLogger(__name__)
 
 EXCLUDED_ENGINEER_FIELDS = {
     "prompt_history",
+    "prompt_count",
     "monthly_performance",
     "recent_actions",
 }
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pymongo.errors import BulkWriteError
+
+from app.core.cache import record_write
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.write_hooks import inserted_hook
+
+logger = logging.getLogger(__name__)
+
+
+# Queued by stop() behind the pending documents; the worker exits when it reaches it
+_STOP: Any = object()
+
+
+class WriteBufferFullError(RuntimeError):
+    """Raised when the buffer stays full for longer than the enqueue timeout."""
+
+
+class WriteBehindBuffer:
+    """Bounded in-process queue that group-commits documents with insert_many.
+
+    A background task flushes when `max_batch` documents are waiting or the
+    oldest waiting document is `max_age_seconds` old, whichever comes first.
+    `on_flush` runs after each flush with the documents that were inserted.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        max_batch: int,
+        max_age_seconds: float,
+        max_pending: int,
+        put_timeout_seconds: float,
+        stop_timeout_seconds: float,
+        on_flush: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None,
+    ) -> None:
+        self.collection_name = collection_name
+        self.max_batch = max_batch
+        self.max_age_seconds = max_age_seconds
+        self.max_pending = max_pending
+        self.put_timeout_seconds = put_timeout_seconds
+        self.stop_timeout_seconds = stop_timeout_seconds
+        self.on_flush = on_flush
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._stopping = False
+        # Set by _flush once insert_many has returned for the batch in hand
+        self._written = False
+        self._interrupted: List[Dict[str, Any]] = []
+        self.enqueued = 0
+        self.rejected = 0
+        self.inserted = 0
+        self.failed = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._worker = asyncio.create_task(self._run())
+        logger.info("Write-behind buffer for %s started", self.collection_name)
+
+    async def stop(self) -> None:
+        """Stop accepting work and let the worker drain the queue.
+
+        The worker stops at a sentinel queued behind the pending documents,
+        so every batch is flushed and its hooks run to completion. Only if
+        draining takes longer than `stop_timeout_seconds` is it cancelled;
+        documents it had not written yet are flushed here instead.
+        """
+        if not self.running:
+            return
+        self._stopping = True
+
+        async def drain() -> None:
+            await self._queue.put(_STOP)
+            await asyncio.shield(self._worker)
+
+        try:
+            await asyncio.wait_for(drain(), timeout=self.stop_timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Write-behind buffer for %s did not drain in %.0fs; cancelling",
+                self.collection_name, self.stop_timeout_seconds,
+            )
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        remaining, self._interrupted = self._interrupted, []
+        while not self._queue.empty():
+            document = self._queue.get_nowait()
+            if document is not _STOP:
+                remaining.append(document)
+        for start in range(0, len(remaining), self.max_batch):
+            await self._flush(remaining[start:start + self.max_batch], retry=True)
+        logger.info("Write-behind buffer for %s stopped", self.collection_name)
+
+    async def put(self, document: Dict[str, Any]) -> None:
+        """Enqueue a document, waiting up to `put_timeout_seconds` for space (backpressure)"""
+        if not self.running or self._stopping:
+            raise WriteBufferFullError("Write-behind buffer is not running")
+        try:
+            await asyncio.wait_for(self._queue.put(document), timeout=self.put_timeout_seconds)
+        except asyncio.TimeoutError as exc:
+            self.rejected += 1
+            raise WriteBufferFullError("Write-behind buffer is full") from exc
+        self.enqueued += 1
+
+    async def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            batch: List[Dict[str, Any]] = []
+            self._written = False
+            try:
+                document = await self._queue.get()
+                if document is _STOP:
+                    return
+                batch.append(document)
+                deadline = time.monotonic() + self.max_age_seconds
+                while len(batch) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        document = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if document is _STOP:
+                        stopped = True
+                        break
+                    batch.append(document)
+                await self._flush(batch)
+            except asyncio.CancelledError:
+                # Only reached when stop() timed out. A batch that was not
+                # written yet is handed to stop(); one that was written is
+                # not re-inserted, but its hooks may be incomplete.
+                if self._written:
+                    logger.error(
+                        "Write-behind buffer for %s cancelled after writing %d documents; "
+                        "derived data may need the rebuild scripts",
+                        self.collection_name, len(batch),
+                    )
+                else:
+                    self._interrupted = batch
+                raise
+
+    async def _flush(self, batch: List[Dict[str, Any]], retry: bool = False) -> None:
+        """Insert one batch and run `on_flush` for what landed.
+
+        With `retry`, the batch may already have been sent by a cancelled
+        flush; ids are assigned before enqueueing, so a duplicate _id means
+        the document was written then and it counts as inserted.
+        """
+        if not batch:
+            return
+        collection = get_database()[self.collection_name]
+        started = time.perf_counter()
+        failed_offsets = set()
+        try:
+            await collection.insert_many(batch, ordered=False)
+        except BulkWriteError as exc:
+            failed_offsets = {
+                error["index"]
+                for error in exc.details.get("writeErrors", [])
+                if not (retry and error.get("code") == 11000 and set(error.get("keyPattern", {})) == {"_id"})
+            }
+            if failed_offsets:
+                logger.error(
+                    "Write-behind flush to %s rejected %d of %d documents",
+                    self.collection_name, len(failed_offsets), len(batch),
+                )
+        except Exception:
+            failed_offsets = set(range(len(batch)))
+            logger.exception(
+                "Write-behind flush to %s failed; dropped %d documents",
+                self.collection_name, len(batch),
+            )
+        self._written = True
+        inserted = len(batch) - len(failed_offsets)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.flushes += 1
+        self.inserted += inserted
+        self.failed += len(failed_offsets)
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+        if inserted:
+            record_write(self.collection_name)
+            if self.on_flush is not None:
+                try:
+                    await self.on_flush(
+                        [document for offset, document in enumerate(batch) if offset not in failed_offsets]
+                    )
+                except Exception:
+                    logger.exception("Write-behind on_flush hook for %s failed", self.collection_name)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_pending": self.max_pending,
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "avg_flush_ms": round(self._total_flush_ms / self.flushes, 2) if self.flushes else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 2),
+        }
+
+
+prompt_write_buffer = WriteBehindBuffer(
+    collection_name="prompts",
+    max_batch=settings.PROMPT_BUFFER_MAX_BATCH,
+    max_age_seconds=settings.PROMPT_BUFFER_MAX_AGE_SECONDS,
+    max_pending=settings.PROMPT_BUFFER_MAX_PENDING,
+    put_timeout_seconds=settings.PROMPT_BUFFER_PUT_TIMEOUT_SECONDS,
+    stop_timeout_seconds=settings.PROMPT_BUFFER_STOP_TIMEOUT_SECONDS,
+    on_flush=partial(inserted_hook, "prompts"),
+)
@@ -0,0 +1,115 @@
+"""
+Benchmark GET /api/v1/engineers/ latency as prompt history grows.
+
+For each history size, a scratch database is filled with engineers in two
+layouts and the real endpoint is called in-process (response cache cleared
+before every request, so each call reads MongoDB and serializes):
+1. Legacy: prompt_history holds every prompt id the engineer created
+2. Capped: prompt_history holds the newest ENGINEER_PROMPT_HISTORY_LIMIT ids
+   plus prompt_count (see scripts/migrate_prompt_history.py)
+
+Only engineer documents are written; GET /engineers/ never reads prompts.
+The scratch database is dropped at the end.
+
+Usage:
+    python scripts/benchmark_engineer_history.py [engineers] [requests]
+"""
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import bson
+import httpx
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core import database
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.main import app
+
+BENCH_DB_NAME = f"{settings.MONGODB_DB_NAME}_history_bench"
+HISTORY_SIZES = [0, 1_000, 10_000, 100_000]
+
+
+def make_engineer(index: int, history_length: int, capped: bool) -> dict:
+    limit = settings.ENGINEER_PROMPT_HISTORY_LIMIT
+    history = [ObjectId() for _ in range(min(history_length, limit) if capped else history_length)]
+    document = {
+        "name": f"Engineer {index}",
+        "title": "Software Engineer",
+        "skills": ["python", "typescript", "mongodb"],
+        "email": f"engineer{index}@example.com",
+        "github_user": f"engineer{index}",
+        "date_hired": datetime(2023, 1, 1),
+        "pr_count": 42,
+        "estimation_accuracy": 0.8,
+        "bug_count": 3,
+        "avg_review_time": 5.5,
+        "token_cost": 120.0,
+        "prompt_history": history,
+        "monthly_performance": [7.5, 8.0, 8.2],
+        "recent_actions": [ObjectId() for _ in range(50)],
+    }
+    if capped:
+        document["prompt_count"] = history_length
+    return document
+
+
+async def measure(http: httpx.AsyncClient, requests: int) -> list:
+    timings = []
+    for _ in range(requests):
+        response_cache.clear()
+        start = time.perf_counter()
+        response = await http.get("/api/v1/engineers/")
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return timings
+
+
+async def main():
+    engineers = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[BENCH_DB_NAME]
+    # Route the app's get_database() to the scratch database
+    database.db.client = client
+    settings.MONGODB_DB_NAME = BENCH_DB_NAME
+
+    try:
+        await client.admin.command('ping')
+        print(f"✅ Connected to MongoDB, using scratch database {BENCH_DB_NAME}")
+        print(f"📊 {engineers} engineers, {requests} requests per case\n")
+        print(f"   {'history':>8}  {'layout':<7} {'doc size':>10} {'p50 ms':>9} {'p95 ms':>9} {'body':>10}")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            for history_length in HISTORY_SIZES:
+                for capped in (False, True):
+                    await db.engineers.delete_many({})
+                    documents = [make_engineer(index, history_length, capped) for index in range(engineers)]
+                    await db.engineers.insert_many(documents)
+                    response_cache.clear()
+
+                    body = len((await http.get("/api/v1/engineers/")).content)
+                    timings = sorted(await measure(http, requests))
+                    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                    print(
+                        f"   {history_length:>8}  {'capped' if capped else 'legacy':<7} "
+                        f"{len(bson.encode(documents[0])) / 1024:>8.1f}KB "
+                        f"{statistics.median(timings):>9.1f} {p95:>9.1f} {body / 1024:>8.1f}KB"
+                    )
+    finally:
+        await client.drop_database(BENCH_DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
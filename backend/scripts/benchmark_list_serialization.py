@@ -0,0 +1,94 @@
+"""
+Benchmark the list response serialization paths without a database.
+
+Compares, for synthetic engineer documents shaped like Motor returns them:
+1. The FastAPI default path: validate against List[Engineer], dump to JSON-able
+   Python, then json.dumps (what response_model=List[Engineer] does)
+2. The fast path used by the list endpoints: shape_documents + orjson
+
+Usage:
+    python scripts/benchmark_list_serialization.py [engineers] [prompt_history_length]
+"""
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.projection import model_projection
+from app.core.serialization import dumps, shape_documents
+from app.models.engineer import Engineer
+
+ROUNDS = 5
+
+
+def make_engineers(count: int, history_length: int) -> List[dict]:
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"Engineer {index}",
+            "title": "Software Engineer",
+            "skills": ["python", "typescript", "mongodb"],
+            "email": f"engineer{index}@example.com",
+            "github_user": f"engineer{index}",
+            "date_hired": datetime(2023, 1, 1),
+            "pr_count": 42,
+            "estimation_accuracy": 0.8,
+            "bug_count": 3,
+            "avg_review_time": 5.5,
+            "token_cost": 120.0,
+            "prompt_history": [ObjectId() for _ in range(history_length)],
+            "monthly_performance": [7.5, 8.0, 8.2],
+            "recent_actions": [ObjectId() for _ in range(50)],
+        }
+        for index in range(count)
+    ]
+
+
+def pydantic_path(adapter: TypeAdapter, documents: List[dict]) -> bytes:
+    validated = adapter.validate_python(documents)
+    content = adapter.dump_python(validated, mode="json", by_alias=True)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(documents: List[dict]) -> bytes:
+    return dumps(shape_documents(Engineer, documents, model_projection(Engineer)))
+
+
+def best_of(func, make_input) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        documents = make_input()
+        start = time.process_time()
+        func(documents)
+        timings.append(time.process_time() - start)
+    return min(timings)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    history_length = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    adapter = TypeAdapter(List[Engineer])
+    template = make_engineers(count, history_length)
+
+    # Fresh shallow copies each round: the fast path fills defaults in place
+    def make_input():
+        return [dict(document) for document in template]
+
+    print(f"📊 {count} engineers × {history_length} prompt_history ids, best of {ROUNDS} rounds\n")
+    slow = best_of(lambda docs: pydantic_path(adapter, docs), make_input)
+    fast = best_of(fast_path, make_input)
+    print(f"   response_model validation + json: {slow * 1000:8.1f} ms CPU per request")
+    print(f"   shape_documents + orjson:         {fast * 1000:8.1f} ms CPU per request")
+    print(f"\n✅ {slow / fast:.1f}x less CPU per request ({(slow - fast) * 1000:.1f} ms saved)")
+
+
+if __name__ == "__main__":
+    main()
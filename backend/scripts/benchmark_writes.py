@@ -0,0 +1,108 @@
+"""
+Benchmark the create/update write paths against a local mongod.
+
+Compares the previous two round-trip handlers (insert_one + find_one,
+update_one + find_one) with the single round-trip ones now used by the
+routers (insert_one returning the local document, find_one_and_update with
+ReturnDocument.AFTER). Writes go to a scratch database that is dropped at the end.
+
+Usage:
+    python scripts/benchmark_writes.py [operations] [concurrency]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+
+BENCH_DB_NAME = f"{settings.MONGODB_DB_NAME}_write_bench"
+
+
+def make_prompt(engineer_id: ObjectId) -> dict:
+    return {
+        "model": "gpt-4o",
+        "date": datetime.utcnow(),
+        "tokens": 512,
+        "text": "Refactor the inventory locking module " * 8,
+        "engineer": engineer_id,
+    }
+
+
+async def create_two_round_trips(collection, engineer_id):
+    result = await collection.insert_one(make_prompt(engineer_id))
+    return await collection.find_one({"_id": result.inserted_id})
+
+
+async def create_one_round_trip(collection, engineer_id):
+    document = make_prompt(engineer_id)
+    await collection.insert_one(document)
+    return document
+
+
+async def update_two_round_trips(collection, prompt_id):
+    await collection.update_one({"_id": prompt_id}, {"$set": {"tokens": 1024}})
+    return await collection.find_one({"_id": prompt_id})
+
+
+async def update_one_round_trip(collection, prompt_id):
+    return await collection.find_one_and_update(
+        {"_id": prompt_id},
+        {"$set": {"tokens": 1024}},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def run(label, operation, collection, arguments, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(argument):
+        async with semaphore:
+            await operation(collection, argument)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded(argument) for argument in arguments))
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<42} {len(arguments) / elapsed:>10.0f} writes/sec")
+
+
+async def main():
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[BENCH_DB_NAME]
+    collection = db.prompts
+
+    try:
+        await client.admin.command('ping')
+        print(f"✅ Connected to MongoDB, using scratch database {BENCH_DB_NAME}")
+        print(f"📊 {operations} operations, concurrency {concurrency}\n")
+
+        engineer_id = ObjectId()
+        engineers = [engineer_id] * operations
+
+        await run("create: insert_one + find_one", create_two_round_trips, collection, engineers, concurrency)
+        await run("create: insert_one (local document)", create_one_round_trip, collection, engineers, concurrency)
+
+        prompt_ids = [
+            document["_id"]
+            async for document in collection.find({}, {"_id": 1}).limit(operations)
+        ]
+        await run("update: update_one + find_one", update_two_round_trips, collection, prompt_ids, concurrency)
+        await run("update: find_one_and_update (AFTER)", update_one_round_trip, collection, prompt_ids, concurrency)
+    finally:
+        await client.drop_database(BENCH_DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
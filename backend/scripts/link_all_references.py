@@ -7,6 +7,13 @@ This script will:
 2. Link actions to engineers and projects (based on original references)
 3. Link projects to engineers and prospects (based on original references)
 4. Update engineers with prompt_history and recent_actions arrays
+
+Seed prompts and actions carry ""/null engineer/project placeholders, which the
+reference validator installed by normalize_references.py rejects. Import them
+with mongoimport --bypassDocumentValidation (or into fresh collections), run
+this script, then run normalize_references.py to archive anything left
+unlinked and (re)install the validator. The link updates themselves bypass
+validation so a partially linked document can be written.
 """
 import asyncio
 import sys
@@ -25,6 +32,9 @@ prospect_map = {}
 project_map = {}
 db = None
 
+# Unlinked placeholders: the shipped collections/*.json use "", process_seed_data.py writes null
+UNSET_REFERENCE = [None, ""]
+
 
 async def create_mappings():
     """Create mappings of names to ObjectIds for all collections"""
@@ -68,7 +78,7 @@ async def link_prompts_to_engineers():
         original_engineer_id_to_name[eng.get("_id")] = eng.get("name")
     
     # Get all prompts from database
-    prompts = await db.prompts.find({"engineer": ""}).to_list(length=10000)
+    prompts = await db.prompts.find({"engineer": {"$in": UNSET_REFERENCE}}).to_list(length=10000)
     
     # Get original prompt data to find engineer references
     original_prompts = seed_data.get("prompts", [])
@@ -90,24 +100,26 @@ async def link_prompts_to_engineers():
             engineer_id = engineer_map[engineer_name]
             await db.prompts.update_one(
                 {"_id": prompt["_id"]},
-                {"$set": {"engineer": engineer_id}}
+                {"$set": {"engineer": engineer_id}},
+                bypass_document_validation=True
             )
             updated_count += 1
     
     print(f"✅ Linked {updated_count} prompts to engineers")
     
-    # Update engineers' prompt_history arrays
+    # Update engineers' prompt_history (newest ids, capped) and prompt_count
     for engineer_name, engineer_id in engineer_map.items():
         prompt_ids = await db.prompts.find(
             {"engineer": engineer_id},
             {"_id": 1}
-        ).to_list(length=10000)
+        ).sort("_id", -1).limit(settings.ENGINEER_PROMPT_HISTORY_LIMIT).to_list(length=None)
+        prompt_count = await db.prompts.count_documents({"engineer": engineer_id})
         
         prompt_object_ids = [p["_id"] for p in prompt_ids]
         if prompt_object_ids:
             await db.engineers.update_one(
                 {"_id": engineer_id},
-                {"$set": {"prompt_history": prompt_object_ids}}
+                {"$set": {"prompt_history": prompt_object_ids, "prompt_count": prompt_count}}
             )
     
     print(f"✅ Updated engineers' prompt_history arrays")
@@ -136,7 +148,9 @@ async def link_actions_to_engineers_and_projects():
         original_project_id_to_title[proj.get("_id")] = proj.get("title")
     
     # Get all actions from database
-    actions = await db.actions.find({"engineer": ""}).to_list(length=10000)
+    actions = await db.actions.find(
+        {"$or": [{"engineer": {"$in": UNSET_REFERENCE}}, {"project": {"$in": UNSET_REFERENCE}}]}
+    ).to_list(length=10000)
     
     # Get original action data
     original_actions = seed_data.get("actions", [])
@@ -169,18 +183,19 @@ async def link_actions_to_engineers_and_projects():
         
         # Link engineer
         engineer_name = mapping.get("engineer")
-        if engineer_name and engineer_name in engineer_map:
+        if action.get("engineer") in UNSET_REFERENCE and engineer_name and engineer_name in engineer_map:
             updates["engineer"] = engineer_map[engineer_name]
         
         # Link project
         project_title = mapping.get("project")
-        if project_title and project_title in project_map:
-            updates["project"] = str(project_map[project_title])
+        if action.get("project") in UNSET_REFERENCE and project_title and project_title in project_map:
+            updates["project"] = project_map[project_title]
         
         if updates:
             await db.actions.update_one(
                 {"_id": action["_id"]},
-                {"$set": updates}
+                {"$set": updates},
+                bypass_document_validation=True
             )
             updated_count += 1
     
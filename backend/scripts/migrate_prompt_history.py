@@ -0,0 +1,98 @@
+"""
+Migrate engineers to the capped prompt_history layout.
+
+Engineer.prompt_history used to hold every prompt id the engineer ever
+created. It now holds only the newest ENGINEER_PROMPT_HISTORY_LIMIT ids
+(newest first) plus a prompt_count; the full history is read from the
+indexed prompts.engineer field (GET /api/v1/prompts/?engineer_id=...).
+
+The migration runs server side:
+1. One aggregation over prompts groups by engineer and $merges the newest
+   ids and the count back into engineers
+2. Engineers with no prompts get an empty history and a zero count
+
+Safe to re-run. Usage:
+    python scripts/migrate_prompt_history.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+
+
+def history_pipeline(limit: int):
+    return [
+        {"$match": {"engineer": {"$type": "objectId"}}},
+        # Newest ids first per engineer. No index has (engineer, _id) order ((engineer, date, _id)
+        # puts date in between), so this is a blocking sort; allowDiskUse lets it spill
+        {"$sort": {"engineer": 1, "_id": -1}},
+        {
+            "$group": {
+                "_id": "$engineer",
+                "prompt_history": {"$push": "$_id"},
+                "prompt_count": {"$sum": 1},
+            }
+        },
+        {"$project": {"prompt_history": {"$slice": ["$prompt_history", limit]}, "prompt_count": 1}},
+        {
+            "$merge": {
+                "into": "engineers",
+                "on": "_id",
+                "whenMatched": "merge",
+                "whenNotMatched": "discard",
+            }
+        },
+    ]
+
+
+async def migrate_prompt_history():
+    """Cap every engineer's prompt_history and backfill prompt_count"""
+    print("🔄 Migrating engineers to capped prompt_history + prompt_count...\n")
+    
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+    
+    try:
+        # Test connection
+        await client.admin.command('ping')
+        print("✅ Connected to MongoDB\n")
+        
+        limit = settings.ENGINEER_PROMPT_HISTORY_LIMIT
+        await db.prompts.aggregate(history_pipeline(limit), allowDiskUse=True).to_list(length=None)
+        
+        reset = await db.engineers.update_many(
+            {"prompt_count": {"$exists": False}},
+            {"$set": {"prompt_history": [], "prompt_count": 0}}
+        )
+        print(f"📋 Reset {reset.modified_count} engineers without prompts")
+        
+        migrated = await db.engineers.count_documents({"prompt_count": {"$gt": 0}})
+        largest = await db.engineers.find_one(
+            {}, {"name": 1, "prompt_count": 1}, sort=[("prompt_count", -1)]
+        )
+        print(f"✅ Backfilled {migrated} engineers (keeping the newest {limit} prompt ids)")
+        if largest:
+            print(f"   Largest history: {largest.get('name', 'Unknown')} with {largest.get('prompt_count', 0)} prompts")
+        
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+    finally:
+        client.close()
+
+
+async def main():
+    """Main function"""
+    await migrate_prompt_history()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
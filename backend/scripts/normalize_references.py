@@ -0,0 +1,117 @@
+"""
+One-shot migration: store every action/prompt reference as an ObjectId or null.
+
+The seed and link scripts used to leave `engineer: ""` placeholders and
+write `project` as a hex string. This script:
+1. Converts hex-string references to ObjectIds ($toObjectId, server-side)
+2. Sets every other non-ObjectId reference ("", unknown strings, missing) to null
+3. Moves actions/prompts left without an engineer to actions_archive/prompts_archive
+4. Installs a $jsonSchema validator so the database rejects other shapes from now on
+
+Each step is one update_many per field, so it is safe to re-run. Afterwards
+rerun the derived-data scripts it prints so stats, usage rollups and engineer
+reference arrays pick up the converted references. Installing the validator
+needs the collMod privilege (dbAdmin); without it the step is skipped with a
+warning.
+
+Usage:
+    python scripts/normalize_references.py
+"""
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import OperationFailure
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.cascade import ARCHIVE_SUFFIX
+from app.core.config import settings
+from app.core.references import REFERENCE_FIELDS, reference_validator
+
+OBJECT_ID_HEX = "^[0-9a-fA-F]{24}$"
+
+
+async def normalize_field(collection, field: str):
+    """Convert one reference field in place; returns (converted, nulled) counts"""
+    converted = await collection.update_many(
+        {field: {"$regex": OBJECT_ID_HEX}},
+        [{"$set": {field: {"$toObjectId": f"${field}"}}}],
+    )
+    nulled = await collection.update_many(
+        {field: {"$not": {"$type": ["objectId", "null"]}}},
+        {"$set": {field: None}},
+    )
+    return converted.modified_count, nulled.modified_count
+
+
+async def archive_orphans(db, collection_name: str, field: str) -> int:
+    """Move documents whose required reference is null to the archive collection"""
+    query = {field: None}
+    if not await db[collection_name].count_documents(query, limit=1):
+        return 0
+    await db[collection_name].aggregate([
+        {"$match": query},
+        {"$set": {"archived_at": datetime.utcnow()}},
+        {"$merge": {"into": collection_name + ARCHIVE_SUFFIX, "whenMatched": "replace"}},
+    ]).to_list(length=None)
+    result = await db[collection_name].delete_many(query)
+    return result.deleted_count
+
+
+async def normalize_references():
+    """Normalize action and prompt references, then enforce the shape with a validator"""
+    print("🔄 Normalizing action and prompt references...\n")
+
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+
+    try:
+        # Test connection
+        await client.admin.command('ping')
+        print("✅ Connected to MongoDB\n")
+
+        for collection_name, fields in REFERENCE_FIELDS.items():
+            for field, required in fields.items():
+                converted, nulled = await normalize_field(db[collection_name], field)
+                print(f"✅ {collection_name}.{field}: {converted} converted to ObjectId, {nulled} set to null")
+                if required:
+                    archived = await archive_orphans(db, collection_name, field)
+                    if archived:
+                        print(f"⚠️  Moved {archived} {collection_name} without a valid {field} to {collection_name}{ARCHIVE_SUFFIX}")
+
+        print()
+        for collection_name in REFERENCE_FIELDS:
+            try:
+                await db.command({
+                    "collMod": collection_name,
+                    "validator": reference_validator(collection_name),
+                    "validationLevel": "strict",
+                    "validationAction": "error",
+                })
+                print(f"✅ Installed reference validator on {collection_name}")
+            except OperationFailure as e:
+                print(f"⚠️  Could not install validator on {collection_name}: {e}")
+
+        print("\n💡 Now run rebuild_engineer_stats.py, rebuild_prompt_usage.py, migrate_prompt_history.py")
+        print("   and update_engineer_recent_actions.py so derived data covers the converted references")
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+    finally:
+        client.close()
+
+
+async def main():
+    """Main function"""
+    await normalize_references()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
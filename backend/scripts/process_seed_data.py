@@ -46,7 +46,7 @@ for prompt in data.get("prompts", []):
         "date": prompt.get("date"),
         "tokens": prompt.get("tokens"),
         "text": prompt.get("text"),
-        "engineer": ""  # Placeholder - will be updated later via linking script
+        "engineer": None  # Placeholder - will be updated later via linking script
     }
     prompts.append(p)
 
@@ -91,10 +91,10 @@ for action in data.get("actions", []):
     a = {
         "title": action.get("title"),
         "description": action.get("description"),
-        "project": action.get("project"),  # Keep original project reference (string or null)
+        "project": None,  # Linked to the project ObjectId later via linking script
         "date": action.get("date"),
         "event": action.get("event"),
-        "engineer": ""  # Placeholder - will be updated later via linking script
+        "engineer": None  # Placeholder - will be updated later via linking script
     }
     actions.append(a)
 
@@ -0,0 +1,67 @@
+"""
+Rebuild the engineer_rankings leaderboard documents from engineers and engineer_stats.
+
+The API refreshes an engineer's profile rankings whenever it creates or updates
+the engineer (and removes them on delete), and the actions/prompts rankings
+whenever the engineer's activity stats change. Run this once after upgrading,
+and after changing engineers, actions or prompts outside the API (seed and link
+scripts, rebuild_engineer_stats.py). Each engineer's entries are upserted and
+entries for engineers that no longer exist are deleted.
+
+Usage:
+    python scripts/rebuild_engineer_rankings.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.engineer_stats import STATS_COLLECTION
+from app.core.rankings import RANKING_FIELDS, RANKINGS_COLLECTION, refresh_engineer_rankings
+
+
+async def rebuild_engineer_rankings():
+    """Recompute every engineer's leaderboard entries"""
+    print(f"🔄 Rebuilding {RANKINGS_COLLECTION} from engineers and {STATS_COLLECTION}...\n")
+    
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+    
+    try:
+        # Test connection
+        await client.admin.command('ping')
+        print("✅ Connected to MongoDB\n")
+        
+        stats_by_engineer = {stats["_id"]: stats async for stats in db[STATS_COLLECTION].find({})}
+        engineer_ids = []
+        async for engineer in db.engineers.find({}, {field: 1 for field in RANKING_FIELDS}):
+            await refresh_engineer_rankings(db, engineer, stats=stats_by_engineer.get(engineer["_id"], {}))
+            engineer_ids.append(engineer["_id"])
+        
+        stale = await db[RANKINGS_COLLECTION].delete_many({"engineer": {"$nin": engineer_ids}})
+        rankings = await db[RANKINGS_COLLECTION].count_documents({})
+        print(f"✅ Ranked {len(engineer_ids)} engineers ({rankings} leaderboard entries)")
+        if stale.deleted_count:
+            print(f"🧹 Removed {stale.deleted_count} entries for deleted engineers")
+        
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+    finally:
+        client.close()
+
+
+async def main():
+    """Main function"""
+    await rebuild_engineer_rankings()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
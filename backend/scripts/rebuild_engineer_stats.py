@@ -0,0 +1,120 @@
+"""
+Rebuild the engineer_stats collection from actions and prompts.
+
+The API keeps engineer_stats current with $inc deltas on every action and
+prompt write. Run this once after upgrading, or after writing actions or
+prompts outside the API. A single aggregation groups actions (per event)
+and prompts per engineer, combines them, and $merges the result into
+engineer_stats. Documents that the rebuild did not touch (engineers with no
+remaining activity) are removed afterwards. Pause ingestion while it runs;
+deltas applied during the rebuild may be overwritten.
+
+Usage:
+    python scripts/rebuild_engineer_stats.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.engineer_stats import STATS_COLLECTION, event_key_expression
+
+
+def stats_pipeline(rebuild_id: ObjectId):
+    """Rooted at actions; prompts join through $unionWith so it is one aggregation"""
+    return [
+        {"$match": {"engineer": {"$type": "objectId"}}},
+        {
+            "$group": {
+                "_id": {"engineer": "$engineer", "event": event_key_expression("$event")},
+                "count": {"$sum": 1},
+                "first": {"$min": "$date"},
+                "last": {"$max": "$date"},
+            }
+        },
+        {
+            "$group": {
+                "_id": "$_id.engineer",
+                "action_count": {"$sum": "$count"},
+                "actions_by_event": {"$push": {"k": "$_id.event", "v": "$count"}},
+                "first_activity": {"$min": "$first"},
+                "last_activity": {"$max": "$last"},
+            }
+        },
+        {"$set": {"actions_by_event": {"$arrayToObject": "$actions_by_event"}}},
+        {
+            "$unionWith": {
+                "coll": "prompts",
+                "pipeline": [
+                    {"$match": {"engineer": {"$type": "objectId"}}},
+                    {
+                        "$group": {
+                            "_id": "$engineer",
+                            "prompt_count": {"$sum": 1},
+                            "token_total": {"$sum": {"$ifNull": ["$tokens", 0]}},
+                            "first_activity": {"$min": "$date"},
+                            "last_activity": {"$max": "$date"},
+                        }
+                    },
+                ],
+            }
+        },
+        {
+            "$group": {
+                "_id": "$_id",
+                "action_count": {"$sum": {"$ifNull": ["$action_count", 0]}},
+                "actions_by_event": {"$mergeObjects": "$actions_by_event"},
+                "prompt_count": {"$sum": {"$ifNull": ["$prompt_count", 0]}},
+                "token_total": {"$sum": {"$ifNull": ["$token_total", 0]}},
+                "first_activity": {"$min": "$first_activity"},
+                "last_activity": {"$max": "$last_activity"},
+            }
+        },
+        {"$set": {"rebuild_id": rebuild_id}},
+        {"$merge": {"into": STATS_COLLECTION, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+
+async def rebuild_engineer_stats():
+    """Recompute every engineer's activity counters"""
+    print(f"🔄 Rebuilding {STATS_COLLECTION} from actions and prompts...\n")
+    
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+    
+    try:
+        # Test connection
+        await client.admin.command('ping')
+        print("✅ Connected to MongoDB\n")
+        
+        rebuild_id = ObjectId()
+        await db.actions.aggregate(stats_pipeline(rebuild_id), allowDiskUse=True).to_list(length=None)
+        
+        # Stats merged above carry this rebuild_id; the rest belong to engineers with no activity left
+        stale = await db[STATS_COLLECTION].delete_many({"rebuild_id": {"$ne": rebuild_id}})
+        total = await db[STATS_COLLECTION].count_documents({})
+        print(f"✅ Rebuilt stats for {total} engineers (removed {stale.deleted_count} stale)")
+        print("\n💡 Now run rebuild_engineer_rankings.py so the actions and prompts leaderboards match")
+        
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+    finally:
+        client.close()
+
+
+async def main():
+    """Main function"""
+    await rebuild_engineer_stats()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
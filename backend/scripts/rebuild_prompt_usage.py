@@ -0,0 +1,89 @@
+"""
+Rebuild the prompt_usage_daily rollups from the prompts collection.
+
+The API keeps the rollups current on every prompt create/update/delete
+(including bulk and write-behind ingestion). Run this once after upgrading,
+or after writing prompts outside the API. One aggregation groups prompts by
+engineer, model and UTC day and replaces the collection with $out (existing
+indexes are kept). Pause prompt ingestion while it runs; writes that land
+during the rebuild can be lost when $out swaps the collection in.
+
+Requires MongoDB 5.0+ ($dateTrunc). Usage:
+    python scripts/rebuild_prompt_usage.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.buckets import date_trunc
+from app.core.config import settings
+from app.core.usage import USAGE_COLLECTION
+
+
+def rollup_pipeline():
+    return [
+        {"$match": {"engineer": {"$type": "objectId"}, "date": {"$type": "date"}}},
+        {
+            "$group": {
+                "_id": {
+                    "engineer": "$engineer",
+                    "model": {"$ifNull": ["$model", ""]},
+                    "day": date_trunc("$date", "day"),
+                },
+                "prompts": {"$sum": 1},
+                "tokens": {"$sum": {"$ifNull": ["$tokens", 0]}},
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "engineer": "$_id.engineer",
+                "model": "$_id.model",
+                "day": "$_id.day",
+                "prompts": 1,
+                "tokens": 1,
+            }
+        },
+        {"$out": USAGE_COLLECTION},
+    ]
+
+
+async def rebuild_prompt_usage():
+    """Recompute every daily usage rollup from prompts"""
+    print(f"🔄 Rebuilding {USAGE_COLLECTION} from prompts...\n")
+    
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+    
+    try:
+        # Test connection
+        await client.admin.command('ping')
+        print("✅ Connected to MongoDB\n")
+        
+        await db.prompts.aggregate(rollup_pipeline(), allowDiskUse=True).to_list(length=None)
+        
+        rollups = await db[USAGE_COLLECTION].count_documents({})
+        prompts = await db.prompts.estimated_document_count()
+        print(f"✅ Wrote {rollups} daily rollups covering ~{prompts} prompts")
+        
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+    finally:
+        client.close()
+
+
+async def main():
+    """Main function"""
+    await rebuild_prompt_usage()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,6 +1,9 @@
 """
 Script to update engineers' recent_actions arrays after removing duplicates.
 This ensures the arrays only contain actions that still exist.
+
+The API keeps recent_actions current on every action create/delete, so this
+is only needed after writing to the actions collection outside the API.
 """
 import asyncio
 import sys
@@ -71,6 +71,19 @@ async function fetchAPI<T>(
 export const engineerAPI = {
   getAll: () => fetchAPI('/engineers/'),
   getById: (id: string) => fetchAPI(`/engineers/${id}`),
+  leaderboard: (options?: {
+    metric?: 'performance' | 'bug_rate' | 'token_cost_per_pr' | 'actions' | 'prompts';
+    window?: 'latest' | '3m' | '6m' | '12m' | 'all';
+    limit?: number;
+  }) => {
+    const params = new URLSearchParams();
+    if (options?.metric) params.append('metric', options.metric);
+    if (options?.window) params.append('window', options.window);
+    if (options?.limit) params.append('limit', String(options.limit));
+    const queryString = params.toString();
+
+    return fetchAPI(`/engineers/leaderboard${queryString ? `?${queryString}` : ''}`);
+  },
   create: (data: any) =>
     fetchAPI('/engineers/', { method: 'POST', body: JSON.stringify(data) }),
   update: (id: string, data: any) =>
@@ -115,6 +128,14 @@ export const prospectAPI = {
 export const projectAPI = {
   getAll: () => fetchAPI('/projects/'),
   getById: (id: string) => fetchAPI(`/projects/${id}`),
+  dashboard: (id: string, options?: { actionsLimit?: number; weeks?: number }) => {
+    const params = new URLSearchParams();
+    if (options?.actionsLimit) params.append('actions_limit', String(options.actionsLimit));
+    if (options?.weeks) params.append('weeks', String(options.weeks));
+    const queryString = params.toString();
+
+    return fetchAPI(`/projects/${id}/dashboard${queryString ? `?${queryString}` : ''}`);
+  },
   create: (data: any) =>
     fetchAPI('/projects/', { method: 'POST', body: JSON.stringify(data) }),
   update: (id: string, data: any) =>
@@ -137,6 +158,40 @@ export const actionAPI = {
 
     return fetchAPI(`/actions${queryString ? `?${queryString}` : ''}`);
   },
+  facets: (filters?: {
+    engineerId?: string;
+    projectId?: string;
+    event?: string;
+    limit?: number;
+  }) => {
+    const params = new URLSearchParams();
+    if (filters?.engineerId) params.append('engineer_id', filters.engineerId);
+    if (filters?.projectId) params.append('project_id', filters.projectId);
+    if (filters?.event) params.append('event', filters.event);
+    if (filters?.limit) params.append('limit', String(filters.limit));
+    const queryString = params.toString();
+
+    return fetchAPI(`/actions/facets${queryString ? `?${queryString}` : ''}`);
+  },
+  histogram: (filters?: {
+    engineerId?: string;
+    projectId?: string;
+    event?: string;
+    start?: string;
+    end?: string;
+    bucket?: 'day' | 'week' | 'month';
+  }) => {
+    const params = new URLSearchParams();
+    if (filters?.engineerId) params.append('engineer_id', filters.engineerId);
+    if (filters?.projectId) params.append('project_id', filters.projectId);
+    if (filters?.event) params.append('event', filters.event);
+    if (filters?.start) params.append('start', filters.start);
+    if (filters?.end) params.append('end', filters.end);
+    if (filters?.bucket) params.append('bucket', filters.bucket);
+    const queryString = params.toString();
+
+    return fetchAPI(`/actions/histogram${queryString ? `?${queryString}` : ''}`);
+  },
   getById: (id: string) => fetchAPI(`/actions/${id}`),
   create: (data: any) =>
     fetchAPI('/actions/', { method: 'POST', body: JSON.stringify(data) }),
@@ -12,6 +12,7 @@ export interface Engineer {
   avg_review_time?: number | null;
   token_cost: number;
   prompt_history: string[];
+  prompt_count: number;
   monthly_performance: number[];
   recent_actions: string[];
 }
@@ -77,3 +78,70 @@ export interface EngineerScore {
   score_hash?: string | null;
   solana_signature?: string | null;
 }
+
+export interface HistogramBucket {
+  start: string;
+  total: number;
+  counts: Record<string, number>;
+}
+
+export interface ActionHistogram {
+  bucket: 'day' | 'week' | 'month';
+  start: string;
+  end: string;
+  events: string[];
+  series: HistogramBucket[];
+}
+
+export interface TeamMemberSummary {
+  _id: string;
+  name: string;
+  title: string;
+  github_user?: string | null;
+  pr_count: number;
+  bug_count: number;
+  token_cost: number;
+  performance?: number | null;
+}
+
+export interface ProspectSummary {
+  _id: string;
+  name: string;
+  title: string;
+  github_user?: string | null;
+  date_applied?: string | null;
+  pr_count: number;
+  bug_count: number;
+  performance: number;
+}
+
+export interface ProjectDashboard {
+  project: Project;
+  team: TeamMemberSummary[];
+  prospects: ProspectSummary[];
+  recent_actions: Action[];
+  activity: ActionHistogram;
+}
+
+export interface ActionFacets {
+  total: number;
+  events: { event: string; count: number }[];
+  engineers: { id: string; name?: string | null; count: number }[];
+  projects: { id: string | null; title?: string | null; count: number }[];
+}
+
+export interface LeaderboardEntry {
+  rank: number;
+  percentile: number;
+  engineer: string;
+  name?: string | null;
+  title?: string | null;
+  value: number;
+}
+
+export interface Leaderboard {
+  metric: 'performance' | 'bug_rate' | 'token_cost_per_pr';
+  window: string;
+  total: number;
+  entries: LeaderboardEntry[];
+}